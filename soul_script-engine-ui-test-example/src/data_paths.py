@@ -38,9 +38,18 @@ DATA_ROOT = os.path.join(_PROJECT_ROOT, "data")
 # Directory getters (auto-create on access)
 # ------------------------------------------------------------------
 
+# Directories already created (or found) by _ensure in this process.  The
+# getters run on every journal/vault/state access, so after the first call
+# a path costs a set lookup instead of a makedirs() syscall.  A directory
+# deleted while the process runs is not recreated.
+_ENSURED: set[str] = set()
+
+
 def _ensure(path: str) -> str:
     """Create directory if needed, return the path."""
-    os.makedirs(path, exist_ok=True)
+    if path not in _ENSURED:
+        os.makedirs(path, exist_ok=True)
+        _ENSURED.add(path)
     return path
 
 
@@ -22,6 +22,11 @@ from typing import Any, Dict, List, Optional
 
 from src.directives.parser import parse_directive_file
 
+_SLUG_STRIP_RE = re.compile(r"[^a-z0-9\s_]")
+_WHITESPACE_RE = re.compile(r"\s+")
+_UNDERSCORES_RE = re.compile(r"_+")
+_TRIGGER_WORD_RE = re.compile(r"[a-z]{4,}")
+
 # ------------------------------------------------------------------
 # Paths
 # ------------------------------------------------------------------
@@ -70,10 +75,10 @@ def _heading_to_id(scope: str, heading: str) -> str:
     """
     # Lowercase, strip non-alphanumeric (keep spaces/underscores)
     slug = heading.lower().strip()
-    slug = re.sub(r"[^a-z0-9\s_]", "", slug)
-    slug = re.sub(r"\s+", "_", slug).strip("_")
+    slug = _SLUG_STRIP_RE.sub("", slug)
+    slug = _WHITESPACE_RE.sub("_", slug).strip("_")
     # Collapse repeated underscores
-    slug = re.sub(r"_+", "_", slug)
+    slug = _UNDERSCORES_RE.sub("_", slug)
     return f"{scope}.{slug}"
 
 
@@ -114,10 +119,7 @@ def generate_manifest(
 
             # Extract trigger keywords from heading + first 200 chars of body
             trigger_text = (section.heading + " " + section.body[:200]).lower()
-            triggers = sorted({
-                w for w in re.findall(r"[a-z]{3,}", trigger_text)
-                if len(w) >= 4
-            })[:10]  # cap at 10 keywords
+            triggers = sorted(set(_TRIGGER_WORD_RE.findall(trigger_text)))[:10]  # cap at 10 keywords
 
             entry: Dict[str, Any] = {
                 "id": dir_id,
@@ -6,8 +6,8 @@ stripped.  Content before the first heading is discarded.
 
 import os
 import re
-from dataclasses import dataclass
-from typing import List
+from dataclasses import dataclass, field
+from typing import List, Optional
 
 _HEADING_RE = re.compile(r"^##\s+(.+)$", re.MULTILINE)
 
@@ -18,6 +18,10 @@ class DirectiveSection:
     body: str
     scope: str
     source_file: str
+    # Content fingerprint of ``heading + "\n" + body``, filled in once by
+    # DirectiveStore at load time so ActiveDirectives can skip rehashing.
+    sha256: Optional[str] = field(default=None, compare=False, repr=False)
+    token_estimate: Optional[int] = field(default=None, compare=False, repr=False)
 
 
 def parse_directive_file(path: str, scope: str) -> List[DirectiveSection]:
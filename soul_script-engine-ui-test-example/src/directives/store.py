@@ -1,44 +1,72 @@
 """Directive store — loads, scores, and searches directive sections.
 
-Scoring uses the same algorithm as :mod:`src.memory.vault`:
-token overlap + substring bonus + SequenceMatcher ratio.
+``DirectiveStore.search`` ranks sections by TF-IDF cosine similarity.
+Each section is tokenized once at load time into an inverted index
+(token -> [(section, weight)]), so a query only touches the postings of
+its own tokens instead of re-scanning every section's text.  Candidates
+that contain the whole query as a substring get a +0.3 bonus.
+
+The parsed sections and index are shared by all stores over the same
+directory and scopes, and are rebuilt only when a scope file's mtime or
+size changes.
+
+:func:`score_section` scores a single section on its own (token overlap
++ substring bonus) for callers that have no store.
 """
 
+import heapq
+import math
 import os
 import re
-from difflib import SequenceMatcher
-from typing import Dict, List, Optional, Union
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple, Union
 
+from src.directives.manifest import _estimate_tokens, _sha256
 from src.directives.parser import DirectiveSection, parse_directive_file
 
+_TOKEN_RE = re.compile(r"\w+")
+SUBSTRING_BONUS = 0.3
+
+# (dir, scopes) -> (file stamps, (sections, texts, postings, idf)).  Shared
+# by every store over the same files, so a store created per session only
+# parses and indexes the markdown again after one of the files changes.
+_LOADED: Dict[Tuple[str, Tuple[str, ...]], Tuple[tuple, tuple]] = {}
+
+
+def _file_stamp(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _section_text(section: DirectiveSection) -> str:
+    # Heading + body: the heading is high-signal and scored with the body.
+    return (section.heading + " " + section.body).lower()
+
 
 def score_section(query: str, section: DirectiveSection) -> float:
     """Score a directive section against a query.
 
-    Algorithm (mirrors MemoryVault.search_memories):
-      1. Token overlap ratio
-      2. Substring bonus (+0.3)
-      3. SequenceMatcher ratio * 0.4
+    Token overlap ratio plus a substring bonus (+0.3).
     Returns 0.0 when there is no token overlap.
     """
     query_lower = query.lower()
-    query_tokens = set(re.findall(r"\w+", query_lower))
+    query_tokens = set(_TOKEN_RE.findall(query_lower))
     if not query_tokens:
         return 0.0
 
-    # Combine heading + body for matching
-    text_lower = (section.heading + " " + section.body).lower()
-    text_tokens = set(re.findall(r"\w+", text_lower))
+    text_lower = _section_text(section)
+    text_tokens = set(_TOKEN_RE.findall(text_lower))
 
     overlap = len(query_tokens & text_tokens)
     if overlap == 0:
         return 0.0
 
     token_score = overlap / len(query_tokens)
-    substr_bonus = 0.3 if query_lower in text_lower else 0.0
-    seq_score = SequenceMatcher(None, query_lower, text_lower).ratio() * 0.4
-
-    return token_score + substr_bonus + seq_score
+    substr_bonus = SUBSTRING_BONUS if query_lower in text_lower else 0.0
+    return token_score + substr_bonus
 
 
 class DirectiveStore:
@@ -51,26 +79,79 @@ class DirectiveStore:
         else:
             self._scopes = [s.lower() for s in scopes]
         self._sections: List[DirectiveSection] = []
+        # Lowered heading + body per section, parallel to _sections.
+        self._texts: List[str] = []
+        # token -> [(section index, L2-normalized tf-idf weight)]
+        self._postings: Dict[str, List[Tuple[int, float]]] = {}
+        self._idf: Dict[str, float] = {}
         self._loaded = False
 
     def _ensure_loaded(self) -> None:
         if self._loaded:
             return
-        for scope in self._scopes:
-            path = os.path.join(self._dir, f"{scope}.md")
+        paths = [os.path.join(self._dir, f"{scope}.md") for scope in self._scopes]
+        key = (os.path.abspath(self._dir), tuple(self._scopes))
+        stamps = tuple(_file_stamp(p) for p in paths)
+        cached = _LOADED.get(key)
+        if cached is not None and cached[0] == stamps:
+            self._sections, self._texts, self._postings, self._idf = cached[1]
+            self._loaded = True
+            return
+        for scope, path in zip(self._scopes, paths):
             self._sections.extend(parse_directive_file(path, scope))
+        for s in self._sections:
+            full_content = s.heading + "\n" + s.body
+            s.sha256 = _sha256(full_content)
+            s.token_estimate = _estimate_tokens(full_content)
+        self._build_index()
+        _LOADED[key] = (stamps, (self._sections, self._texts, self._postings, self._idf))
         self._loaded = True
 
+    def _build_index(self) -> None:
+        self._texts = [_section_text(s) for s in self._sections]
+        counts = [Counter(_TOKEN_RE.findall(t)) for t in self._texts]
+        df: Counter = Counter()
+        for tf in counts:
+            df.update(tf.keys())
+        n = len(counts)
+        # Smoothed idf, as in scikit-learn: never zero, so a token found
+        # in every section still counts as overlap.
+        self._idf = {t: math.log((1 + n) / (1 + d)) + 1.0 for t, d in df.items()}
+        postings: Dict[str, List[Tuple[int, float]]] = defaultdict(list)
+        for i, tf in enumerate(counts):
+            weights = {t: c * self._idf[t] for t, c in tf.items()}
+            norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+            for t, w in weights.items():
+                postings[t].append((i, w / norm))
+        self._postings = dict(postings)
+
     def search(self, query: str, limit: int = 5) -> List[DirectiveSection]:
         """Return sections ranked by relevance to *query*."""
         self._ensure_loaded()
-        scored = []
-        for section in self._sections:
-            s = score_section(query, section)
-            if s > 0:
-                scored.append((s, section))
-        scored.sort(key=lambda t: t[0], reverse=True)
-        return [sec for _, sec in scored[:limit]]
+        query_lower = query.lower()
+        q_tf = Counter(t for t in _TOKEN_RE.findall(query_lower) if t in self._idf)
+        if not q_tf or limit <= 0:
+            return []
+
+        q_weights = {t: c * self._idf[t] for t, c in q_tf.items()}
+        q_norm = math.sqrt(sum(w * w for w in q_weights.values()))
+        scores: Dict[int, float] = defaultdict(float)
+        for t, qw in q_weights.items():
+            for i, w in self._postings[t]:
+                scores[i] += qw / q_norm * w
+
+        # The substring check walks section text, so only apply it to the
+        # strongest candidates; it can reorder them but rarely promotes a
+        # section from further down.
+        # Only the top few are needed, so select with a bounded heap instead
+        # of sorting every match.  Ties keep file order (lower index first).
+        candidates = heapq.nlargest(4 * limit, scores.items(), key=lambda t: (t[1], -t[0]))
+        scored = [
+            (s + (SUBSTRING_BONUS if query_lower in self._texts[i] else 0.0), i)
+            for i, s in candidates
+        ]
+        best = heapq.nlargest(limit, scored, key=lambda t: (t[0], -t[1]))
+        return [self._sections[i] for _, i in best]
 
     def list_headings(self) -> List[Dict[str, str]]:
         """Return all section headings with their scope."""
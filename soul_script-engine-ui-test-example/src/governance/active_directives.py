@@ -4,17 +4,38 @@ Maintains an in-memory registry of which directives were actually injected
 into the prompt pipeline for this session.  Exposes read-only accessors
 for governance tracking.
 
-Thread-safe for single-process use.  Stateless across sessions — each
-session starts empty and populates on load.
+The registry lives in a :class:`contextvars.ContextVar`, so each thread
+and each asyncio task (one per web request) gets its own; concurrent
+sessions never see each other's directives and no lock is needed.
+A new thread starts empty.  A copied context (e.g. a task spawned after
+entries were recorded) shares its parent's registry until it calls
+:meth:`ActiveDirectives.reset`, which only affects the current context.
+Stateless across sessions — each session starts empty and populates on
+load.
 """
 
 import json
-from datetime import datetime, timezone
+import time
+from contextvars import ContextVar
 from typing import Any, Dict, List, Optional
 
 from src.directives.manifest import _sha256, _estimate_tokens
 
 
+# (epoch second, its "%Y-%m-%dT%H:%M:%SZ" form).  Entries are stamped to
+# the second, so a batch recorded within one second formats the time once.
+_stamp_cache = (-1, "")
+
+
+def _utc_stamp() -> str:
+    global _stamp_cache
+    sec = int(time.time())
+    cached = _stamp_cache
+    if cached[0] != sec:
+        cached = _stamp_cache = (sec, time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(sec)))
+    return cached[1]
+
+
 # ------------------------------------------------------------------
 # Active directive entry
 # ------------------------------------------------------------------
@@ -54,18 +75,41 @@ class _ActiveEntry:
 
 
 # ------------------------------------------------------------------
-# Singleton tracker
+# Per-context tracker
 # ------------------------------------------------------------------
 
+class _Registry:
+    # Column-oriented: each entry's dict is built once in record(), and the
+    # fields that ids()/summary() aggregate are kept as their own columns,
+    # so none of the accessors walk entry objects attribute by attribute.
+    __slots__ = ("rows", "ids", "scopes", "tokens")
+
+    def __init__(self):
+        self.rows: List[Dict[str, Any]] = []
+        self.ids: List[str] = []
+        self.scopes: List[str] = []
+        self.tokens: List[int] = []
+
+
+_registry_var: ContextVar[Optional[_Registry]] = ContextVar(
+    "active_directives", default=None)
+
+
 class ActiveDirectives:
     """Session-scoped registry of directives actually loaded into the prompt."""
 
-    _entries: List[_ActiveEntry] = []
+    @staticmethod
+    def _registry() -> _Registry:
+        reg = _registry_var.get()
+        if reg is None:
+            reg = _Registry()
+            _registry_var.set(reg)
+        return reg
 
     @classmethod
     def reset(cls) -> None:
         """Clear all entries (for tests / session start)."""
-        cls._entries = []
+        _registry_var.set(_Registry())
 
     @classmethod
     def record(
@@ -75,14 +119,23 @@ class ActiveDirectives:
         scope: str,
         *,
         manifest_entry: Optional[Dict[str, Any]] = None,
+        sha256: Optional[str] = None,
+        token_estimate: Optional[int] = None,
     ) -> Dict[str, Any]:
         """Register a directive section as actively loaded.
 
         If *manifest_entry* is provided, uses its id/version.
         Otherwise, generates a synthetic ID from scope + heading.
+        *sha256* / *token_estimate*, when already known for this content,
+        are used as-is instead of being recomputed.
         """
-        full_content = heading + "\n" + body
-        now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        if sha256 is None or token_estimate is None:
+            full_content = heading + "\n" + body
+            if sha256 is None:
+                sha256 = _sha256(full_content)
+            if token_estimate is None:
+                token_estimate = _estimate_tokens(full_content)
+        now = _utc_stamp()
 
         if manifest_entry:
             dir_id = manifest_entry.get("id", f"{scope}.{heading}")
@@ -92,17 +145,21 @@ class ActiveDirectives:
             dir_id = _heading_to_id(scope, heading)
             version = "unknown"
 
-        entry = _ActiveEntry(
+        row = _ActiveEntry(
             id=dir_id,
             name=heading,
             scope=scope,
             version=version,
-            sha256=_sha256(full_content),
+            sha256=sha256,
             loaded_at_utc=now,
-            token_estimate=_estimate_tokens(full_content),
-        )
-        cls._entries.append(entry)
-        return entry.to_dict()
+            token_estimate=token_estimate,
+        ).to_dict()
+        reg = cls._registry()
+        reg.rows.append(row)
+        reg.ids.append(dir_id)
+        reg.scopes.append(scope)
+        reg.tokens.append(row["token_estimate"])
+        return dict(row)
 
     @classmethod
     def record_sections(
@@ -113,6 +170,8 @@ class ActiveDirectives:
         """Batch-record a list of DirectiveSection objects.
 
         Optionally cross-references against a manifest dict for IDs/versions.
+        Hashes and token estimates cached on the sections by DirectiveStore
+        are reused.
         """
         manifest_by_name: Dict[str, Dict[str, Any]] = {}
         if manifest:
@@ -127,29 +186,32 @@ class ActiveDirectives:
                 body=section.body,
                 scope=section.scope,
                 manifest_entry=me,
+                sha256=getattr(section, "sha256", None),
+                token_estimate=getattr(section, "token_estimate", None),
             ))
         return results
 
     @classmethod
     def list(cls) -> List[Dict[str, Any]]:
         """Return a snapshot of all active directives (read-only)."""
-        return [e.to_dict() for e in cls._entries]
+        return [dict(row) for row in cls._registry().rows]
 
     @classmethod
     def ids(cls) -> List[str]:
         """Return just the IDs of active directives."""
-        return [e.id for e in cls._entries]
+        return list(cls._registry().ids)
 
     @classmethod
     def summary(cls) -> Dict[str, Any]:
         """Compact summary suitable for snapshots / change logs."""
+        reg = cls._registry()
         return {
-            "count": len(cls._entries),
-            "ids": cls.ids(),
-            "scopes": sorted({e.scope for e in cls._entries}),
-            "total_tokens": sum(e.token_estimate for e in cls._entries),
+            "count": len(reg.ids),
+            "ids": list(reg.ids),
+            "scopes": sorted(set(reg.scopes)),
+            "total_tokens": sum(reg.tokens),
         }
 
     @classmethod
     def count(cls) -> int:
-        return len(cls._entries)
+        return len(cls._registry().ids)
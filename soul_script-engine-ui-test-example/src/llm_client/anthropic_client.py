@@ -7,15 +7,37 @@ Set ANTHROPIC_API_KEY in your environment, or the client will fall back to the
 profile dict (not recommended for production).
 """
 
+import asyncio
 import json
 import os
 import uuid
 from typing import Any, Dict, List, Optional
 
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from src.llm_client.base import LLMClient, LLMResponse
 
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2)
+    _HTTP2 = True
+except ImportError:  # httpx[http2] not installed; HTTP/1.1 keep-alive only
+    _HTTP2 = False
+
+# Retry rate limits and gateway errors a couple of times, honouring
+# Retry-After.  read=0: a request that reached the API and then timed out
+# may already have been processed, so it is not replayed.
+_RETRY = Retry(
+    total=2,
+    read=0,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset({"POST"}),
+    raise_on_status=False,
+)
+
 
 class AnthropicClient(LLMClient):
     """Native Anthropic provider for the agent runtime."""
@@ -44,6 +66,37 @@ class AnthropicClient(LLMClient):
                 "Export it before running with the anthropic provider."
             )
 
+        # One pooled session per client: every turn after the first reuses
+        # the kept-alive TLS connection instead of handshaking again.
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(
+            pool_connections=4, pool_maxsize=8, max_retries=_RETRY,
+        ))
+        self._session.headers.update(self._default_headers())
+        # Async pool for achat(), created on first use.  An AsyncClient's
+        # connections belong to the event loop that opened them, so it is
+        # rebuilt whenever achat() runs on a different loop.
+        self._aclient: Optional[httpx.AsyncClient] = None
+        self._aloop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _default_headers(self) -> Dict[str, str]:
+        return {
+            "x-api-key": self.api_key,
+            "content-type": "application/json",
+            "anthropic-version": "2023-06-01",
+        }
+
+    def close(self) -> None:
+        """Release the pooled HTTP connections."""
+        self._session.close()
+
+    async def aclose(self) -> None:
+        """Release the async connection pool used by :meth:`achat`."""
+        if self._aclient is not None:
+            await self._aclient.aclose()
+            self._aclient = None
+            self._aloop = None
+
     # ------------------------------------------------------------------
     # Main chat entry-point
     # ------------------------------------------------------------------
@@ -52,12 +105,51 @@ class AnthropicClient(LLMClient):
         messages: List[Dict[str, Any]],
         tools: Optional[List[Dict[str, Any]]] = None,
     ) -> LLMResponse:
-        headers = {
-            "x-api-key": self.api_key,
-            "content-type": "application/json",
-            "anthropic-version": "2023-06-01",
-        }
+        resp = self._session.post(
+            f"{self.base_url}/v1/messages",
+            json=self._build_body(messages, tools),
+            timeout=(5, 180),  # (connect, read)
+        )
+        resp.raise_for_status()
+        data = resp.json()
+
+        return self._parse_response(data)
 
+    async def achat(
+        self,
+        messages: List[Dict[str, Any]],
+        tools: Optional[List[Dict[str, Any]]] = None,
+    ) -> LLMResponse:
+        """Async counterpart of :meth:`chat`.
+
+        Calls share one pooled ``httpx.AsyncClient``, so several turns can
+        be awaited together (``asyncio.gather(*(c.achat(m) for m in batch))``)
+        and finish in about the time of the slowest.
+        """
+        loop = asyncio.get_running_loop()
+        if self._aclient is None or self._aloop is not loop:
+            # A client left over from a previous (possibly closed) loop
+            # can't be closed from this one; drop it with its pool.
+            self._aloop = loop
+            self._aclient = httpx.AsyncClient(
+                http2=_HTTP2,
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=20),
+                timeout=httpx.Timeout(180, connect=5),
+                headers=self._default_headers(),
+            )
+        resp = await self._aclient.post(
+            f"{self.base_url}/v1/messages",
+            json=self._build_body(messages, tools),
+        )
+        resp.raise_for_status()
+        return self._parse_response(resp.json())
+
+    def _build_body(
+        self,
+        messages: List[Dict[str, Any]],
+        tools: Optional[List[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        """Assemble the Messages API request body."""
         # Separate system message from conversation messages
         system_text, conv_messages = self._extract_system(messages)
 
@@ -76,16 +168,7 @@ class AnthropicClient(LLMClient):
         if api_tools:
             body["tools"] = api_tools
 
-        resp = requests.post(
-            f"{self.base_url}/v1/messages",
-            headers=headers,
-            json=body,
-            timeout=180,
-        )
-        resp.raise_for_status()
-        data = resp.json()
-
-        return self._parse_response(data)
+        return body
 
     # ------------------------------------------------------------------
     # Tool schema conversion
@@ -7,7 +7,9 @@ Architecture
 - **FAISS index** provides fast semantic (meaning-based) search over
   vault contents.  The index is an ephemeral cache rebuilt from the vault.
 - On startup: load vault, embed active memories, build FAISS index.
-- On write: write to vault first, then add embedding to FAISS index.
+- On write: write to vault first (flushed to disk before the index is
+  touched, so the index never references unsaved records), then add the
+  embedding to the FAISS index.
 - On delete: soft-delete in vault, exclude from FAISS results.
 - The index files (*.faiss) are saved to disk for fast reload, but the
   vault is always authoritative.  Lost index = just rebuild.
@@ -20,9 +22,11 @@ Usage
     results = mem.search("what does Creator like?")
 """
 
+import functools
 import json
 import logging
 import os
+import threading
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
 
@@ -30,11 +34,24 @@ import faiss
 import numpy as np
 from sentence_transformers import SentenceTransformer
 
+from src.memory.locking import locked
 from src.memory.vault import VaultStore
 from src.memory.types import Memory
 
 log = logging.getLogger(__name__)
 
+# Up to IVF_THRESHOLD vectors the index is exact (IndexFlatIP).  Past it,
+# rebuilds and reloads switch to IVF-PQ: queries only scan ``nprobe`` of
+# the inverted lists and each vector is stored as IVF_PQ_M one-byte
+# codes, trading ~1-2% recall on top-k for a much faster, smaller index.
+IVF_THRESHOLD = 5000
+IVF_NLIST = 256
+IVF_PQ_M = 32
+DEFAULT_NPROBE = 8
+
+# Texts per encoder forward pass when embedding many memories at once.
+EMBED_BATCH_SIZE = 64
+
 
 class FAISSMemory:
     """Semantic memory system: vault.jsonl storage + FAISS vector search."""
@@ -44,18 +61,33 @@ class FAISSMemory:
         vault_path: str,
         faiss_dir: str,
         model_name: str = "all-mpnet-base-v2",
+        nprobe: int = DEFAULT_NPROBE,
+        use_mmap: bool = False,
     ):
         self.vault = VaultStore(vault_path)
+        # Serializes every public call: the web app reaches one shared
+        # instance from worker threads, and FAISS add/save must not run
+        # alongside a search.
+        self._lock = threading.RLock()
         self.faiss_dir = Path(faiss_dir)
         self.faiss_dir.mkdir(parents=True, exist_ok=True)
         self.model_name = model_name
+        self.nprobe = nprobe
+        # Memory-map saved IVF indexes read-only instead of reading them
+        # into RAM: loading is near-instant and worker processes share the
+        # pages through the OS cache.  A mapped index cannot be added to,
+        # so the first write reopens it normally (see _ensure_writable).
+        self.use_mmap = use_mmap
+        self._mmapped = False
 
         # Lazy-loaded encoder
         self._encoder: Optional[SentenceTransformer] = None
         self._embedding_dim: Optional[int] = None
 
         # FAISS index + mapping
-        self.index: Optional[faiss.IndexFlatIP] = None
+        self.index: Optional[faiss.Index] = None
+        # "Flat" or the index_factory spec of the IVF-PQ index
+        self.index_spec = "Flat"
         # Maps FAISS row position -> vault memory id
         self._idx_to_id: List[str] = []
         # Maps vault memory id -> FAISS row position
@@ -63,6 +95,10 @@ class FAISSMemory:
         # Set of deleted vault ids (excluded from results)
         self._deleted_ids: set = set()
 
+        # Query embeddings are a pure function of the text, so repeated
+        # searches (resends, regenerations) skip the encoder entirely.
+        self._encode_query = functools.lru_cache(maxsize=256)(self._encode_query_uncached)
+
         # Try to load cached index, otherwise build from vault
         self._load_or_build()
 
@@ -85,10 +121,17 @@ class FAISSMemory:
             _ = self.encoder  # trigger load
         return self._embedding_dim
 
+    def _encode_query_uncached(self, query: str) -> np.ndarray:
+        """Normalized (1, dim) float32 embedding of a search query."""
+        q_vec = self._embed([query])
+        q_vec.setflags(write=False)  # shared between cache hits
+        return q_vec
+
     # ------------------------------------------------------------------
     # Public API - Write
     # ------------------------------------------------------------------
 
+    @locked
     def add(
         self,
         text: str,
@@ -107,7 +150,8 @@ class FAISSMemory:
             text=text, scope=scope, category=category,
             tags=tags, source=source, tier=tier, topic_id=topic_id,
         )
-        self._embed_and_add(mem)
+        self.vault.flush()
+        self._embed_and_add([mem])
         self._save_index()
         return mem
 
@@ -140,6 +184,7 @@ class FAISSMemory:
         except ValueError as exc:
             return {"status": "rejected", "reason": str(exc)}
 
+    @locked
     def update(
         self,
         memory_id: str,
@@ -154,35 +199,48 @@ class FAISSMemory:
         new_ver = self.vault.update_memory(
             memory_id, text=text, category=category, tags=tags,
         )
+        self.vault.flush()
         if text is not None:
             # Text changed -> need to re-embed
             # Mark old index entry as deleted, add new embedding
             self._deleted_ids.add(memory_id)
-            self._embed_and_add(new_ver)
+            self._embed_and_add([new_ver])
             self._save_index()
         return new_ver
 
+    @locked
     def delete(self, memory_id: str) -> bool:
         """Soft-delete a memory in vault and exclude from FAISS results."""
         ok = self.vault.delete_memory(memory_id)
+        self.vault.flush()
         if ok:
             self._deleted_ids.add(memory_id)
             self._save_index()
         return ok
 
-    def bulk_delete(self, memory_ids: List[str]) -> Dict[str, List[str]]:
-        """Soft-delete multiple memories."""
+    @locked
+    def bulk_delete(self, memory_ids: List[str]) -> Dict[str, Any]:
+        """Soft-delete multiple memories.
+
+        Returns ``{deleted, deleted_count, not_found}``.
+        """
         result = self.vault.bulk_delete(memory_ids)
-        for mid in result["deleted"]:
-            self._deleted_ids.add(mid)
-        if result["deleted"]:
+        self.vault.flush()
+        deleted = result["deleted"]
+        self._deleted_ids.update(deleted)
+        if deleted:
             self._save_index()
-        return result
+        return {
+            "deleted": deleted,
+            "deleted_count": len(deleted),
+            "not_found": result["not_found"],
+        }
 
     # ------------------------------------------------------------------
     # Public API - Read / Search
     # ------------------------------------------------------------------
 
+    @locked
     def search(
         self,
         query: str,
@@ -198,9 +256,7 @@ class FAISSMemory:
         if self.index is None or self.index.ntotal == 0:
             return []
 
-        # Embed query
-        q_vec = self.encoder.encode([query], convert_to_numpy=True).astype("float32")
-        faiss.normalize_L2(q_vec)
+        q_vec = self._encode_query(query)
 
         # Search more than needed to account for filtered-out results
         search_k = min(top_k * 5, self.index.ntotal)
@@ -245,6 +301,7 @@ class FAISSMemory:
 
         return results
 
+    @locked
     def recall(
         self,
         scope: Optional[Union[str, List[str]]] = None,
@@ -270,10 +327,22 @@ class FAISSMemory:
         results.sort(key=lambda m: m.created_at, reverse=True)
         return results[:limit]
 
+    @locked
+    def size(self) -> int:
+        """Number of live (non-deleted) memories in the vault.
+
+        Cheap enough to call before every search: counted from the vault's
+        in-memory index, with no embedding pass.  ``_deleted_ids`` is not
+        used - it also holds ids that were never in this FAISS index.
+        """
+        return self.vault.active_count()
+
+    @locked
     def get(self, memory_id: str) -> Optional[Memory]:
         """Get a single memory by id."""
         return self.vault.get_memory(memory_id)
 
+    @locked
     def list_all(
         self,
         scope: Optional[Union[str, List[str]]] = None,
@@ -289,6 +358,7 @@ class FAISSMemory:
     # Stats & Maintenance
     # ------------------------------------------------------------------
 
+    @locked
     def stats(self) -> Dict[str, Any]:
         """Combined vault + FAISS statistics."""
         vault_stats = self.vault.stats()
@@ -302,6 +372,7 @@ class FAISSMemory:
         )
         vault_stats["vault_total_lines"] = raw
         vault_stats["embedding_model"] = self.model_name
+        vault_stats["index_spec"] = self.index_spec
         vault_stats["faiss_dir"] = str(self.faiss_dir)
         # Backward-compat keys for web dashboard templates
         vault_stats["max_active"] = "∞"
@@ -311,6 +382,7 @@ class FAISSMemory:
         vault_stats["in_sync"] = vault_stats["faiss_effective"] == active
         return vault_stats
 
+    @locked
     def compact(self) -> Dict[str, Any]:
         """Compact vault (remove old versions/tombstones) and rebuild index."""
         result = self.vault.compact()
@@ -318,6 +390,7 @@ class FAISSMemory:
         result["faiss_vectors"] = rebuild_result["vectors"]
         return result
 
+    @locked
     def rebuild_index(self) -> Dict[str, Any]:
         """Rebuild the FAISS index from scratch using all active vault memories.
 
@@ -326,8 +399,7 @@ class FAISSMemory:
         """
         active = self.vault.read_active()
         if not active:
-            dim = self.embedding_dim
-            self.index = faiss.IndexFlatIP(dim)
+            self._set_index(faiss.IndexFlatIP(self.embedding_dim), "Flat")
             self._idx_to_id = []
             self._id_to_idx = {}
             self._deleted_ids = set()
@@ -338,15 +410,9 @@ class FAISSMemory:
         ids = [m.id for m in active]
 
         log.info("[faiss] Rebuilding index from %d vault memories...", len(active))
-        embeddings = self.encoder.encode(
-            texts, batch_size=32, show_progress_bar=False,
-            convert_to_numpy=True,
-        ).astype("float32")
-        faiss.normalize_L2(embeddings)
+        embeddings = self._embed(texts)
 
-        dim = embeddings.shape[1]
-        self.index = faiss.IndexFlatIP(dim)
-        self.index.add(embeddings)
+        self._set_index(*_build_index(embeddings))
 
         self._idx_to_id = list(ids)
         self._id_to_idx = {vid: i for i, vid in enumerate(ids)}
@@ -367,10 +433,15 @@ class FAISSMemory:
         index_path = self.faiss_dir / "index.faiss"
         meta_path = self.faiss_dir / "index_meta.json"
 
-        faiss.write_index(self.index, str(index_path))
+        # Write-then-rename: other processes may have the old file mapped,
+        # and truncating it in place would pull the pages out from under them.
+        tmp_path = index_path.with_suffix(".faiss.tmp")
+        faiss.write_index(self.index, str(tmp_path))
+        os.replace(tmp_path, index_path)
 
         meta = {
             "model_name": self.model_name,
+            "index_spec": self.index_spec,
             "idx_to_id": self._idx_to_id,
             "deleted_ids": list(self._deleted_ids),
         }
@@ -384,9 +455,13 @@ class FAISSMemory:
 
         if index_path.exists() and meta_path.exists():
             try:
-                self.index = faiss.read_index(str(index_path))
                 with open(meta_path, "r", encoding="utf-8") as f:
                     meta = json.load(f)
+                spec = meta.get("index_spec", "Flat")
+                mmap = self.use_mmap and spec != "Flat"
+                flags = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY if mmap else 0
+                self._set_index(faiss.read_index(str(index_path), flags), spec)
+                self._mmapped = mmap
                 self._idx_to_id = meta.get("idx_to_id", [])
                 self._id_to_idx = {vid: i for i, vid in enumerate(self._idx_to_id)}
                 self._deleted_ids = set(meta.get("deleted_ids", []))
@@ -403,10 +478,15 @@ class FAISSMemory:
                 missing = active_ids - indexed_ids
                 if missing:
                     log.info("[faiss] %d new vault memories to index", len(missing))
-                    for mid in missing:
-                        mem = self.vault.get_memory(mid)
-                        if mem:
-                            self._embed_and_add(mem)
+                    mems = [self.vault.get_memory(mid) for mid in missing]
+                    self._embed_and_add([m for m in mems if m])
+                    self._save_index()
+
+                # A flat index that has grown past the threshold is
+                # upgraded in place from its stored vectors (no re-encode).
+                if self.index_spec == "Flat" and self.index.ntotal > IVF_THRESHOLD:
+                    log.info("[faiss] %d vectors, upgrading to IVF-PQ", self.index.ntotal)
+                    self._set_index(*_build_index(self.index.reconstruct_n(0, self.index.ntotal)))
                     self._save_index()
 
                 # Mark any vault-deleted memories as deleted in index
@@ -429,28 +509,68 @@ class FAISSMemory:
             self.rebuild_index()
         else:
             # Empty vault -> empty index
-            dim = self.embedding_dim
-            self.index = faiss.IndexFlatIP(dim)
+            self._set_index(faiss.IndexFlatIP(self.embedding_dim), "Flat")
             self._idx_to_id = []
             self._id_to_idx = {}
             self._deleted_ids = set()
 
-    def _embed_and_add(self, mem: Memory) -> None:
-        """Embed a single memory and add to the FAISS index."""
-        vec = self.encoder.encode([mem.text], convert_to_numpy=True).astype("float32")
-        faiss.normalize_L2(vec)
+    def _set_index(self, index: faiss.Index, spec: str) -> None:
+        ivf = faiss.try_extract_index_ivf(index)
+        if ivf is not None:
+            ivf.nprobe = self.nprobe
+        self.index = index
+        self.index_spec = spec
+        self._mmapped = False
+
+    def _ensure_writable(self) -> None:
+        """Swap a read-only mapped index for an in-memory copy."""
+        if self._mmapped:
+            self._set_index(faiss.read_index(str(self.faiss_dir / "index.faiss")), self.index_spec)
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        """L2-normalized float32 embeddings, encoded in batches."""
+        vecs = self.encoder.encode(
+            texts, batch_size=EMBED_BATCH_SIZE, show_progress_bar=False,
+            convert_to_numpy=True, normalize_embeddings=True,
+        )
+        return np.ascontiguousarray(vecs, dtype="float32")
+
+    def _embed_and_add(self, mems: List[Memory]) -> None:
+        """Embed memories in one batched pass and append them to the index."""
+        if not mems:
+            return
+        self._ensure_writable()
+        vecs = self._embed([m.text for m in mems])
 
         if self.index is None:
-            dim = vec.shape[1]
-            self.index = faiss.IndexFlatIP(dim)
+            self._set_index(faiss.IndexFlatIP(vecs.shape[1]), "Flat")
 
-        self.index.add(vec)
-        idx = self.index.ntotal - 1
+        start = self.index.ntotal
+        self.index.add(vecs)
         # Extend the mapping
-        while len(self._idx_to_id) <= idx:
+        while len(self._idx_to_id) < start:
             self._idx_to_id.append("")
-        self._idx_to_id[idx] = mem.id
-        self._id_to_idx[mem.id] = idx
+        del self._idx_to_id[start:]
+        for idx, mem in enumerate(mems, start):
+            self._idx_to_id.append(mem.id)
+            self._id_to_idx[mem.id] = idx
+
+
+def _build_index(embeddings: np.ndarray) -> Tuple[faiss.Index, str]:
+    """Index normalized *embeddings*: flat when small, else trained IVF-PQ.
+
+    Returns ``(index, spec)`` with the rows added in order.
+    """
+    n, dim = embeddings.shape
+    if n <= IVF_THRESHOLD or dim % IVF_PQ_M:
+        index, spec = faiss.IndexFlatIP(dim), "Flat"
+    else:
+        # Keep >= 39 training points per list, faiss's own minimum.
+        spec = f"IVF{min(IVF_NLIST, n // 39)},PQ{IVF_PQ_M}"
+        index = faiss.index_factory(dim, spec, faiss.METRIC_INNER_PRODUCT)
+        index.train(embeddings)
+    index.add(embeddings)
+    return index, spec
 
 
 def _normalize_scopes(scope) -> set:
@@ -0,0 +1,16 @@
+"""Locking helper shared by the memory stores.
+
+``VaultStore`` and ``FAISSMemory`` each serialize their public methods
+on a per-instance ``threading.RLock`` stored as ``self._lock``.
+"""
+
+import functools
+
+
+def locked(method):
+    """Run *method* while holding the instance's ``_lock``."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
@@ -11,10 +11,14 @@ Architecture
 - Notes and Soul Scripts are chunked by ``src.memory.chunker`` into
   ``### header``-delimited sections.
 - Chunks are embedded with sentence-transformers and stored in a FAISS
-  IndexFlatIP (cosine similarity).
+  inner-product index (cosine similarity): IndexFlatIP for small corpora,
+  IndexHNSWFlat once there are ``HNSW_MIN_CHUNKS`` or more chunks.  Set
+  ``SOULSCRIPT_FAISS_INDEX=flat`` (or ``hnsw``) to force one or the other.
 - A metadata sidecar (``notes_meta.json``) tracks chunk→note mappings.
 - The index is rebuilt via ``build_index()`` or the ``/api/faiss/reindex``
-  web route.  It is never modified by agents.
+  web route.  It is never modified by agents.  A rebuild only encodes
+  chunks whose text is new; vectors for unchanged chunks are copied from
+  the index already on disk, so editing one note re-embeds just that note.
 
 Usage
 -----
@@ -39,6 +43,25 @@ log = logging.getLogger(__name__)
 _INDEX_FILE = "notes_index.faiss"
 _META_FILE = "notes_meta.json"
 
+# Below this many chunks an exact flat scan is as fast as a graph walk.
+HNSW_MIN_CHUNKS = 1000
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+
+
+def _make_index(dim: int, n: int) -> faiss.Index:
+    """Create an empty inner-product index suited to *n* vectors."""
+    kind = os.environ.get("SOULSCRIPT_FAISS_INDEX", "").strip().lower()
+    if kind not in ("flat", "hnsw"):
+        kind = "hnsw" if n >= HNSW_MIN_CHUNKS else "flat"
+    if kind == "flat":
+        return faiss.IndexFlatIP(dim)
+    index = faiss.IndexHNSWFlat(dim, HNSW_M, faiss.METRIC_INNER_PRODUCT)
+    index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+    index.hnsw.efSearch = HNSW_EF_SEARCH
+    return index
+
 
 class NotesFAISS:
     """Read-only FAISS index over chunked soul scripts / directive notes."""
@@ -56,7 +79,7 @@ class NotesFAISS:
         self._embedding_dim: Optional[int] = None
 
         # FAISS index + chunk metadata
-        self.index: Optional[faiss.IndexFlatIP] = None
+        self.index: Optional[faiss.Index] = None
         self._chunks: List[Dict[str, Any]] = []  # ordered by FAISS row
 
     # ------------------------------------------------------------------
@@ -96,19 +119,54 @@ class NotesFAISS:
             self._save()
             return 0
 
-        texts = [c["text"] for c in chunks]
-        vecs = self.encoder.encode(texts, normalize_embeddings=True,
-                                   show_progress_bar=True, batch_size=32)
-        vecs = np.ascontiguousarray(vecs, dtype="float32")
+        known = self._stored_vectors()
+        missing = [t for t in dict.fromkeys(c["text"] for c in chunks) if t not in known]
+        if missing:
+            new_vecs = self.encoder.encode(missing, normalize_embeddings=True,
+                                           show_progress_bar=False, batch_size=64,
+                                           convert_to_numpy=True)
+            known.update(zip(missing, new_vecs))
+        # Fill one preallocated matrix rather than stacking a list of rows.
+        vecs = np.empty((len(chunks), len(known[chunks[0]["text"]])), dtype="float32")
+        for i, c in enumerate(chunks):
+            vecs[i] = known[c["text"]]
+        log.info("[notes_faiss] Encoded %d new chunks, reused %d",
+                 len(missing), len(chunks) - len(missing))
 
         dim = vecs.shape[1]
-        self.index = faiss.IndexFlatIP(dim)
+        self.index = _make_index(dim, len(chunks))
         self.index.add(vecs)
         self._chunks = chunks
         self._save()
         log.info("[notes_faiss] Indexed %d chunks (%d dims)", len(chunks), dim)
         return len(chunks)
 
+    def _stored_vectors(self) -> Dict[str, np.ndarray]:
+        """Map chunk text -> embedding for the index currently on disk.
+
+        Returns an empty dict when there is no usable previous index (none
+        saved, a different model, or index and metadata out of step).
+        """
+        idx_path = self.faiss_dir / _INDEX_FILE
+        meta_path = self.faiss_dir / _META_FILE
+        if not idx_path.exists() or not meta_path.exists():
+            return {}
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("model_name") != self.model_name:
+                return {}
+            old_chunks = meta.get("chunks", [])
+            index = faiss.read_index(
+                str(idx_path), faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+            if index.ntotal != len(old_chunks) or index.ntotal == 0:
+                return {}
+            vecs = index.reconstruct_n(0, index.ntotal)
+        except Exception as exc:
+            log.warning("[notes_faiss] Previous index unusable, re-encoding all: %s", exc)
+            return {}
+        return {c["text"]: vecs[i] for i, c in enumerate(old_chunks)}
+
     # ------------------------------------------------------------------
     # Search
     # ------------------------------------------------------------------
@@ -141,30 +199,21 @@ class NotesFAISS:
         vec = self.encoder.encode([query], normalize_embeddings=True)
         vec = np.ascontiguousarray(vec, dtype="float32")
 
-        # When filtering by note_ids, search ALL chunks (index is small, ~100-300 chunks)
-        # to ensure we never miss relevant results due to filtered items filling search_k
-        search_k = self.index.ntotal if (note_ids or builtin_filenames) else min(self.index.ntotal, top_k * 2)
-        scores, idxs = self.index.search(vec, search_k)
-
-        results: List[Tuple[Dict[str, Any], float]] = []
-        for score, idx in zip(scores[0], idxs[0]):
-            if idx < 0:
-                continue
-            chunk = self._chunks[idx]
-            doc_id = chunk.get("metadata", {}).get("document_id", "")
-
-            # Apply filter if requested
-            if note_ids is not None or builtin_filenames is not None:
-                ids = note_ids or set()
-                builtins = builtin_filenames or set()
-                if doc_id not in ids and doc_id not in builtins:
-                    continue
-
-            results.append((chunk, float(score)))
-            if len(results) >= top_k:
-                break
-
-        return results
+        if note_ids is not None or builtin_filenames is not None:
+            # Score only the allowed chunks exactly, so filtered-out items can
+            # never crowd relevant ones out of an approximate (HNSW) result set.
+            allowed = (note_ids or set()) | (builtin_filenames or set())
+            rows = [i for i, c in enumerate(self._chunks)
+                    if c.get("metadata", {}).get("document_id", "") in allowed]
+            if not rows:
+                return []
+            scores = self.index.reconstruct_batch(np.asarray(rows, dtype="int64")) @ vec[0]
+            order = np.argsort(-scores, kind="stable")[:top_k]
+            return [(self._chunks[rows[j]], float(scores[j])) for j in order]
+
+        scores, idxs = self.index.search(vec, min(self.index.ntotal, top_k))
+        return [(self._chunks[idx], float(score))
+                for score, idx in zip(scores[0], idxs[0]) if idx >= 0]
 
     # ------------------------------------------------------------------
     # Persistence
@@ -176,7 +225,11 @@ class NotesFAISS:
         meta_path = self.faiss_dir / _META_FILE
 
         if self.index is not None:
-            faiss.write_index(self.index, str(idx_path))
+            # Write-then-rename so processes that have the old file mapped
+            # (see load) keep reading a complete index.
+            tmp_path = idx_path.with_suffix(".faiss.tmp")
+            faiss.write_index(self.index, str(tmp_path))
+            os.replace(tmp_path, idx_path)
 
         with open(meta_path, "w", encoding="utf-8") as f:
             json.dump({
@@ -199,7 +252,13 @@ class NotesFAISS:
 
         try:
             obj = cls(faiss_dir, model_name=model_name)
-            obj.index = faiss.read_index(str(idx_path))
+            # Never mutated after load (build_index makes a new index), so
+            # map it read-only and let processes share the pages.
+            obj.index = faiss.read_index(
+                str(idx_path), faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+            hnsw = getattr(obj.index, "hnsw", None)
+            if hnsw is not None:
+                hnsw.efSearch = HNSW_EF_SEARCH
             with open(meta_path, "r", encoding="utf-8") as f:
                 data = json.load(f)
             obj._chunks = data.get("chunks", [])
@@ -223,5 +282,6 @@ class NotesFAISS:
             "total_chunks": total,
             "unique_documents": len(doc_ids),
             "model_name": self.model_name,
+            "index_type": type(self.index).__name__ if self.index else None,
             "index_file": str(self.faiss_dir / _INDEX_FILE),
         }
@@ -8,19 +8,43 @@ Rule set (from spec):
 import re
 from typing import List, Tuple
 
+try:
+    import re2 as _screen_re  # optional: google-re2, linear-time DFA matching
+except ImportError:
+    _screen_re = re
+
 # (compiled regex, human-readable label)
-_PII_PATTERNS: List[Tuple[re.Pattern, str]] = [
+_PII_PATTERNS: Tuple[Tuple[re.Pattern, str], ...] = (
     (re.compile(r"\b\d{3}-\d{2}-\d{4}\b"), "SSN (xxx-xx-xxxx)"),
     (re.compile(r"\b\d{9}\b"), "potential SSN (9 consecutive digits)"),
     (re.compile(r"\b(?:\d[ -]*?){13,19}\b"), "credit/debit card number"),
-]
+)
 
-_BLOCKED_KEYWORDS: List[str] = [
+_BLOCKED_KEYWORDS: Tuple[str, ...] = (
     "password:", "passwd:", "api_key:", "apikey:", "api key:",
     "secret_key:", "secretkey:", "secret key:",
     "access_token:", "auth_token:", "bearer ",
     "ssn:", "social security number:",
-]
+)
+
+# Violation messages are fixed per rule, so build them once here.
+_PATTERN_RULES: Tuple[Tuple[re.Pattern, str], ...] = tuple(
+    (pattern, f"Pattern match: {label}") for pattern, label in _PII_PATTERNS
+)
+_KEYWORD_RULES: Tuple[Tuple[str, str], ...] = tuple(
+    (keyword, f"Blocked keyword detected: '{keyword.rstrip(':').strip()}'")
+    for keyword in _BLOCKED_KEYWORDS
+)
+
+# Every rule fused into one alternation per input, so clean text (the
+# common case) is screened in a single scan.  Only a screen hit pays for
+# the per-rule passes that name the violations.
+_PATTERN_SCREEN = _screen_re.compile(
+    "|".join(f"(?:{pattern.pattern})" for pattern, _ in _PII_PATTERNS)
+)
+_KEYWORD_SCREEN = _screen_re.compile(
+    "|".join(re.escape(keyword) for keyword in _BLOCKED_KEYWORDS)
+)
 
 
 def check_pii(text: str) -> List[str]:
@@ -28,12 +52,10 @@ def check_pii(text: str) -> List[str]:
     violations: List[str] = []
     lower = text.lower().strip()
 
-    for keyword in _BLOCKED_KEYWORDS:
-        if keyword in lower:
-            violations.append(f"Blocked keyword detected: '{keyword.rstrip(':').strip()}'")
+    if _KEYWORD_SCREEN.search(lower):
+        violations += [msg for keyword, msg in _KEYWORD_RULES if keyword in lower]
 
-    for pattern, label in _PII_PATTERNS:
-        if pattern.search(text):
-            violations.append(f"Pattern match: {label}")
+    if _PATTERN_SCREEN.search(text):
+        violations += [msg for pattern, msg in _PATTERN_RULES if pattern.search(text)]
 
     return violations
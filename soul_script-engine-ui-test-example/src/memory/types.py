@@ -15,6 +15,7 @@ The ``tier`` field is stored on every Memory record.  Old records
 missing the field default to ``"canon"`` for backward compat.
 """
 
+import sys
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, List, Optional
@@ -59,10 +60,14 @@ JOURNAL_ONLY_SIGNALS = frozenset({
 MAX_MEMORY_TEXT_LENGTH = 1200
 
 
-@dataclass
+@dataclass(slots=True)
 class Memory:
     """A single memory record in the vault.
 
+    Slotted (no per-instance ``__dict__``); the low-cardinality fields
+    ``scope``, ``category``, ``tier`` and ``source`` are interned on load
+    so a large vault shares one string object per distinct value.
+
     New fields vs. the original schema:
     - ``tier``: "canon" | "register" — controls injection priority & lifecycle.
     - ``topic_id``: optional stable key for register-tier records so the
@@ -103,17 +108,21 @@ class Memory:
 
     @classmethod
     def from_dict(cls, d: Dict) -> "Memory":
+        # Positional arguments skip keyword matching; every optional field
+        # still falls back to its default, so older or hand-edited lines
+        # that omit one load as before.
+        source = d.get("source")
         return cls(
-            id=d["id"],
-            text=d["text"],
-            scope=d["scope"],
-            category=d["category"],
-            tier=d.get("tier", "canon"),        # backward compat
-            topic_id=d.get("topic_id"),
-            tags=d.get("tags", []),
-            created_at=d.get("created_at", ""),
-            updated_at=d.get("updated_at"),
-            source=d.get("source"),
-            deleted_at=d.get("deleted_at"),
-            version=d.get("version", 1),
+            d["id"],
+            d["text"],
+            sys.intern(d["scope"]),
+            sys.intern(d["category"]),
+            sys.intern(d.get("tier", "canon")),        # backward compat
+            d.get("topic_id"),
+            d.get("tags", []),
+            d.get("created_at", ""),
+            d.get("updated_at"),
+            sys.intern(source) if source is not None else None,
+            d.get("deleted_at"),
+            d.get("version", 1),
         )
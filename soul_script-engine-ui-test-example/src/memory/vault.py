@@ -12,14 +12,24 @@ persistence, versioning, and compaction.
 
 import json
 import os
-import uuid
+import secrets
+import sys
+import threading
+import weakref
+from collections import Counter
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Set, Union
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple, Union
 from zoneinfo import ZoneInfo
 
+from src.memory.locking import locked
 from src.memory.types import Memory
 from src.memory.pii_guard import check_pii
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
+
 # US Central Time - used for all vault timestamps.
 _CT = ZoneInfo("America/Chicago")
 
@@ -29,23 +39,172 @@ def _now_ct() -> str:
     return datetime.now(_CT).isoformat()
 
 
-class VaultStore:
-    """Append-only JSONL storage for Memory records."""
+if orjson is not None:
+    def _dumps_line(d: Dict[str, Any]) -> bytes:
+        return orjson.dumps(d) + b"\n"
+
+    _loads = orjson.loads
+else:
+    def _dumps_line(d: Dict[str, Any]) -> bytes:
+        return (json.dumps(d, ensure_ascii=False) + "\n").encode("utf-8")
+
+    _loads = json.loads  # accepts UTF-8 bytes directly
+
+
+# The vault file is read in chunks of this size (fewer syscalls and
+# per-line buffer refills than iterating the file object).
+_READ_CHUNK = 1 << 20
+
+# A buffered store writes its pending appends once they reach this many bytes.
+_FLUSH_THRESHOLD = 64 * 1024
+
+
+# writev() takes at most this many buffers per call (POSIX IOV_MAX floor).
+_IOV_MAX = 1024
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _write_pending(path: str, pending: List[bytes], sync: bool = False) -> None:
+    """Append *pending* lines to *path*, then fsync if *sync* is set.
+
+    Uses scatter-gather ``os.writev`` where available, so the lines go
+    out without first being joined into one large buffer.  The file is
+    opened ``O_APPEND`` so concurrent appenders never interleave a batch.
+    """
+    if not pending:
+        return
+    flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0)
+    fd = os.open(path, flags, 0o666)
+    try:
+        if hasattr(os, "writev"):
+            for i in range(0, len(pending), _IOV_MAX):
+                batch = pending[i:i + _IOV_MAX]
+                written = os.writev(fd, batch)
+                if written < sum(map(len, batch)):
+                    _write_all(fd, b"".join(batch)[written:])
+        else:
+            _write_all(fd, b"".join(pending))
+        if sync:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class _Pending:
+    """Lines appended but not yet written, shared with the exit finalizer."""
+
+    __slots__ = ("lines", "nbytes")
+
+    def __init__(self):
+        self.lines: List[bytes] = []
+        self.nbytes = 0
+
+
+def _flush_at_exit(path: str, pending: _Pending) -> None:
+    # The store is unreachable, so nothing else touches *pending* now.  If
+    # the vault's directory has already been removed there is nowhere left
+    # to write, and the lines are dropped rather than raising at exit.
+    try:
+        _write_pending(path, pending.lines)
+    except OSError:
+        pass
+    pending.lines = []
+
+
+def _iter_lines(path: str) -> Iterator[bytes]:
+    """Yield raw lines of *path*, reading it in ``_READ_CHUNK`` pieces."""
+    with open(path, "rb", buffering=0) as f:
+        tail = b""
+        while True:
+            chunk = f.read(_READ_CHUNK)
+            if not chunk:
+                break
+            lines = (tail + chunk).split(b"\n")
+            tail = lines.pop()
+            yield from lines
+        if tail:
+            yield tail
+
 
-    def __init__(self, path: str):
+def _file_sig(path: str) -> Optional[Tuple[int, int]]:
+    """``(mtime_ns, size)`` of *path*, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _tombstone(current: Memory, deleted_at: str) -> Memory:
+    """Next version of *current*, marked deleted at *deleted_at*."""
+    return Memory(
+        id=current.id,
+        text=current.text,
+        scope=current.scope,
+        category=current.category,
+        tier=current.tier,
+        topic_id=current.topic_id,
+        tags=list(current.tags),
+        created_at=current.created_at,
+        updated_at=current.updated_at,
+        source=current.source,
+        deleted_at=deleted_at,
+        version=current.version + 1,
+    )
+
+
+class VaultStore:
+    """Append-only JSONL storage for Memory records.
+
+    Every write is appended to the file (one write per batch) before the
+    call returns.  With ``buffered=True`` appends are instead held in
+    memory and written in batches: when the buffer reaches
+    ``_FLUSH_THRESHOLD``, before a raw read, on ``flush()``, and when the
+    store is garbage-collected or the interpreter exits.  Only ``flush()``
+    and ``compact()`` fsync.
+
+    All public methods hold one re-entrant lock, so a store can be shared
+    between threads.
+
+    Latest-version lookups are served from an in-memory ``id -> Memory``
+    index, built by one scan of the file and kept live on every append.
+    If the file is changed by anyone else (another store, a manual edit)
+    the index is rebuilt on the next read.  Records returned by the read
+    methods are shared with the index - treat them as read-only.
+    """
+
+    def __init__(self, path: str, *, buffered: bool = False):
         self.path = path
         dir_name = os.path.dirname(path)
         if dir_name:
             os.makedirs(dir_name, exist_ok=True)
+        self._lock = threading.RLock()
+        self._buffered = buffered
+        self._pending = _Pending()
+        if buffered:
+            self._finalizer = weakref.finalize(self, _flush_at_exit, path, self._pending)
+        # Latest version per id; None until first needed.
+        self._by_id: Optional[Dict[str, Memory]] = None
+        # File signature as of our last scan/flush, to spot outside edits.
+        self._synced_sig: Optional[Tuple[int, int]] = None
+        # Raw line count (file + pending), tracked alongside the index.
+        self._raw_lines = 0
 
     # ------------------------------------------------------------------
     # Write operations
     # ------------------------------------------------------------------
 
+    @locked
     def add(self, mem: Memory) -> None:
         """Append a memory record to the vault file."""
         self._append(mem)
 
+    @locked
     def create_memory(
         self,
         text: str,
@@ -69,11 +228,11 @@ class VaultStore:
             raise ValueError(f"PII detected - memory blocked: {'; '.join(pii)}")
 
         mem = Memory(
-            id=uuid.uuid4().hex[:12],
+            id=self._new_id(),
             text=text,
-            scope=scope.lower(),
-            category=category.lower(),
-            tier=tier.lower(),
+            scope=sys.intern(scope.lower()),
+            category=sys.intern(category.lower()),
+            tier=sys.intern(tier.lower()),
             topic_id=topic_id,
             tags=tags or [],
             created_at=_now_ct(),
@@ -82,6 +241,7 @@ class VaultStore:
         self._append(mem)
         return mem
 
+    @locked
     def update_memory(
         self,
         memory_id: str,
@@ -95,8 +255,7 @@ class VaultStore:
 
         Returns the new version.  Raises KeyError if not found.
         """
-        resolved = self.resolve_latest()
-        current = resolved.get(memory_id)
+        current = self._index().get(memory_id)
         if current is None or not current.is_active():
             raise KeyError(f"Memory '{memory_id}' not found or already deleted")
 
@@ -112,8 +271,8 @@ class VaultStore:
             id=current.id,
             text=text if text is not None else current.text,
             scope=current.scope,
-            category=(category.lower() if category else current.category),
-            tier=(tier.lower() if tier else current.tier),
+            category=(sys.intern(category.lower()) if category else current.category),
+            tier=(sys.intern(tier.lower()) if tier else current.tier),
             topic_id=(topic_id if topic_id is not None else current.topic_id),
             tags=(tags if tags is not None else list(current.tags)),
             created_at=current.created_at,
@@ -125,85 +284,67 @@ class VaultStore:
         self._append(new_version)
         return new_version
 
+    @locked
     def delete_memory(self, memory_id: str) -> bool:
         """Soft-delete by appending a tombstone.  Returns True if found."""
-        resolved = self.resolve_latest()
-        current = resolved.get(memory_id)
+        current = self._index().get(memory_id)
         if current is None or not current.is_active():
             return False
 
-        tombstone = Memory(
-            id=current.id,
-            text=current.text,
-            scope=current.scope,
-            category=current.category,
-            tier=current.tier,
-            topic_id=current.topic_id,
-            tags=list(current.tags),
-            created_at=current.created_at,
-            updated_at=current.updated_at,
-            source=current.source,
-            deleted_at=_now_ct(),
-            version=current.version + 1,
-        )
-        self._append(tombstone)
+        self._append(_tombstone(current, _now_ct()))
         return True
 
+    @locked
     def bulk_delete(self, memory_ids: List[str]) -> Dict[str, List[str]]:
-        """Soft-delete multiple memories.  Returns {deleted, not_found}."""
-        resolved = self.resolve_latest()
+        """Soft-delete multiple memories.  Returns {deleted, not_found}.
+
+        All tombstones go to disk together in one write.
+        """
+        resolved = self._index()
         deleted, not_found = [], []
+        tombstones: List[Memory] = []
         now = _now_ct()
         for mid in memory_ids:
             current = resolved.get(mid)
             if current is None or not current.is_active():
                 not_found.append(mid)
                 continue
-            tombstone = Memory(
-                id=current.id, text=current.text, scope=current.scope,
-                category=current.category, tier=current.tier,
-                topic_id=current.topic_id, tags=list(current.tags),
-                created_at=current.created_at, updated_at=current.updated_at,
-                source=current.source, deleted_at=now,
-                version=current.version + 1,
-            )
-            self._append(tombstone)
+            tombstones.append(_tombstone(current, now))
             deleted.append(mid)
+        if tombstones:
+            self._append_many(tombstones)
+            self._flush()
         return {"deleted": deleted, "not_found": not_found}
 
     # ------------------------------------------------------------------
     # Read operations
     # ------------------------------------------------------------------
 
+    @locked
     def read_all(self) -> List[Memory]:
         """Read every raw line (all versions, including tombstones)."""
-        if not os.path.exists(self.path):
-            return []
-        records: List[Memory] = []
-        with open(self.path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    records.append(Memory.from_dict(json.loads(line)))
-        return records
+        self._flush()
+        return list(self._scan())
 
+    @locked
     def resolve_latest(self) -> Dict[str, Memory]:
         """Resolve each id to its highest-version record."""
-        latest: Dict[str, Memory] = {}
-        for m in self.read_all():
-            prev = latest.get(m.id)
-            if prev is None or m.version > prev.version:
-                latest[m.id] = m
-        return latest
+        return dict(self._index())
 
+    @locked
     def read_active(self) -> List[Memory]:
         """Return only non-deleted latest-version records."""
-        return [m for m in self.resolve_latest().values() if m.is_active()]
+        return [m for m in self._index().values() if m.is_active()]
+
+    @locked
+    def active_count(self) -> int:
+        """Number of non-deleted memories, counted from the in-memory index."""
+        return sum(1 for m in self._index().values() if m.is_active())
 
+    @locked
     def get_memory(self, memory_id: str) -> Optional[Memory]:
         """Get a single memory by id (latest version, must be active)."""
-        resolved = self.resolve_latest()
-        m = resolved.get(memory_id)
+        m = self._index().get(memory_id)
         if m and m.is_active():
             return m
         return None
@@ -212,52 +353,141 @@ class VaultStore:
     # Maintenance
     # ------------------------------------------------------------------
 
+    @locked
     def compact(self) -> Dict[str, int]:
-        """Rewrite vault to only active latest versions."""
+        """Rewrite vault to only active latest versions.
+
+        Written straight from the in-memory index - the old file is not
+        re-read or re-parsed.  The new file is built beside the vault,
+        fsynced, then swapped in with ``os.replace`` so a crash leaves
+        either the old vault or the new one, never a torn mix.
+        """
+        index = self._index()
+        self._flush()
         active = sorted(
-            self.read_active(),
+            (m for m in index.values() if m.is_active()),
             key=lambda m: (m.category, m.created_at),
         )
-        raw_before = len(self.read_all())
+        raw_before = self._raw_lines
+        lines_after = 0
         tmp_path = self.path + ".compact.tmp"
-        with open(tmp_path, "w", encoding="utf-8") as f:
-            for m in active:
-                f.write(json.dumps(m.to_dict(), ensure_ascii=False) + "\n")
-        os.replace(tmp_path, self.path)
+        try:
+            with open(tmp_path, "wb", buffering=_READ_CHUNK) as f:
+                for m in active:
+                    f.write(_dumps_line(m.to_dict()))
+                    lines_after += 1
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._by_id = {m.id: m for m in active}
+        self._raw_lines = lines_after
+        self._synced_sig = _file_sig(self.path)
         return {
             "lines_before": raw_before,
-            "lines_after": len(active),
-            "lines_removed": raw_before - len(active),
+            "lines_after": lines_after,
+            "lines_removed": raw_before - lines_after,
         }
 
+    @locked
     def stats(self) -> Dict[str, Any]:
         """Basic storage stats."""
-        resolved = self.resolve_latest()
+        resolved = self._index()
         active = [m for m in resolved.values() if m.is_active()]
-        raw_lines = len(self.read_all())
-        by_scope: Dict[str, int] = {}
-        by_category: Dict[str, int] = {}
-        by_tier: Dict[str, int] = {}
-        for m in active:
-            by_scope[m.scope] = by_scope.get(m.scope, 0) + 1
-            by_category[m.category] = by_category.get(m.category, 0) + 1
-            by_tier[m.tier] = by_tier.get(m.tier, 0) + 1
         return {
             "active_count": len(active),
             "deleted_count": len(resolved) - len(active),
-            "raw_lines": raw_lines,
-            "by_scope": by_scope,
-            "by_category": by_category,
-            "by_tier": by_tier,
+            # Kept in step with the index, so no re-read of the file.
+            "raw_lines": self._raw_lines,
+            "by_scope": dict(Counter(m.scope for m in active)),
+            "by_category": dict(Counter(m.category for m in active)),
+            "by_tier": dict(Counter(m.tier for m in active)),
         }
 
+    @locked
+    def flush(self) -> None:
+        """Write any buffered appends to disk and fsync.  Safe to call repeatedly."""
+        self._flush(sync=True)
+
     # ------------------------------------------------------------------
     # Internal
     # ------------------------------------------------------------------
 
+    def _flush(self, sync: bool = False) -> None:
+        """Write pending appends; the caller holds ``_lock``."""
+        pending = self._pending
+        if not pending.lines:
+            return
+        lines, pending.lines, pending.nbytes = pending.lines, [], 0
+        in_sync = _file_sig(self.path) == self._synced_sig
+        try:
+            _write_pending(self.path, lines, sync)
+        except BaseException:
+            pending.lines[:0] = lines  # keep them for the next attempt
+            pending.nbytes += sum(map(len, lines))
+            raise
+        # Only our own lines were added, so the index still matches.
+        self._synced_sig = _file_sig(self.path) if in_sync else None
+
+    def _scan(self) -> Iterator[Memory]:
+        """Yield every record on disk (pending appends not included)."""
+        if not os.path.exists(self.path):
+            return
+        for line in _iter_lines(self.path):
+            line = line.strip()
+            if line:
+                yield Memory.from_dict(_loads(line))
+
+    def _index(self) -> Dict[str, Memory]:
+        """The live ``id -> latest Memory`` index, (re)built if stale."""
+        if self._by_id is None or _file_sig(self.path) != self._synced_sig:
+            self._flush()
+            latest: Dict[str, Memory] = {}
+            raw_lines = 0
+            for m in self._scan():
+                raw_lines += 1
+                prev = latest.get(m.id)
+                if prev is None or m.version > prev.version:
+                    latest[m.id] = m
+            self._by_id = latest
+            self._raw_lines = raw_lines
+            self._synced_sig = _file_sig(self.path)
+        return self._by_id
+
+    def _new_id(self) -> str:
+        """A fresh 12-hex-char id, redrawn on the (rare) clash with a known id.
+
+        Only checked against the index if it is already loaded - creating
+        a memory never forces a scan of the file.
+        """
+        known = self._by_id or {}
+        mid = secrets.token_hex(6)
+        while mid in known:
+            mid = secrets.token_hex(6)
+        return mid
+
     def _append(self, mem: Memory) -> None:
-        with open(self.path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(mem.to_dict(), ensure_ascii=False) + "\n")
+        self._append_many((mem,))
+
+    def _append_many(self, mems: Sequence[Memory]) -> None:
+        """Queue *mems* as one batch and fold them into the live index.
+
+        Written out at once unless the store is buffered.
+        """
+        if self._by_id is not None:
+            self._raw_lines += len(mems)
+            for mem in mems:
+                prev = self._by_id.get(mem.id)
+                if prev is None or mem.version > prev.version:
+                    self._by_id[mem.id] = mem
+        lines = [_dumps_line(mem.to_dict()) for mem in mems]
+        self._pending.lines.extend(lines)
+        self._pending.nbytes += sum(map(len, lines))
+        if not self._buffered or self._pending.nbytes >= _FLUSH_THRESHOLD:
+            self._flush()
 
 
 # Backward-compat alias so existing `from src.memory.vault import MemoryVault`
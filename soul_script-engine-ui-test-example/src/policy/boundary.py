@@ -21,9 +21,16 @@ Architecture note:
 
 import json
 import os
+import threading
 import time
 from dataclasses import dataclass, field, asdict
-from typing import Any, Dict, List, Optional
+from itertools import islice
+from typing import Any, BinaryIO, Dict, List, Optional
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
 
 
 # ------------------------------------------------------------------
@@ -100,7 +107,7 @@ def _default_proposed_limits(tool_name: str) -> Dict[str, Any]:
 # Boundary event dataclass
 # ------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class BoundaryEvent:
     """Structured record of a boundary contact / capability denial."""
 
@@ -119,6 +126,14 @@ class BoundaryEvent:
         return asdict(self)
 
 
+def _event_line(event: BoundaryEvent) -> bytes:
+    """Serialize *event* as one UTF-8 JSONL line."""
+    if orjson is not None:
+        # orjson serializes dataclasses natively — no to_dict() round-trip.
+        return orjson.dumps(event, default=str) + b"\n"
+    return (json.dumps(event.to_dict(), ensure_ascii=False, default=str) + "\n").encode("utf-8")
+
+
 # ------------------------------------------------------------------
 # Denial payload builder
 # ------------------------------------------------------------------
@@ -186,12 +201,53 @@ class BoundaryLogger:
         dir_name = os.path.dirname(path)
         if dir_name:
             os.makedirs(dir_name, exist_ok=True)
+        # One append-mode handle for the logger's lifetime, opened on the
+        # first append.  Unbuffered, so every event reaches the file in a
+        # single write before append() returns.
+        self._fh: Optional[BinaryIO] = None
+        self._lock = threading.Lock()
 
     def append(self, event: BoundaryEvent) -> None:
-        """Append a single boundary event line.  Thread-safe on Windows
-        for single-process use (append mode)."""
-        with open(self.path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(event.to_dict(), ensure_ascii=False, default=str) + "\n")
+        """Append a single boundary event line.  Thread-safe for
+        single-process use (append mode, one shared handle)."""
+        line = _event_line(event)
+        with self._lock:
+            if self._fh is None or self._fh.closed:
+                self._fh = open(self.path, "ab", buffering=0)
+            self._fh.write(line)
+
+    def flush(self) -> None:
+        """Flush any buffered output to disk."""
+        with self._lock:
+            if self._fh is not None and not self._fh.closed:
+                self._fh.flush()
+
+    def close(self) -> None:
+        """Close the append handle.  A later append() reopens it."""
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+
+    def __del__(self):
+        fh = getattr(self, "_fh", None)
+        if fh is not None:
+            fh.close()
+
+    def count(self) -> int:
+        """Number of logged events.  Scans lines without parsing JSON."""
+        if not os.path.exists(self.path):
+            return 0
+        with open(self.path, "rb") as f:
+            return sum(1 for line in f if line.strip())
+
+    def head(self, n: int) -> List[BoundaryEvent]:
+        """Parse and return only the first *n* events."""
+        if n <= 0 or not os.path.exists(self.path):
+            return []
+        with open(self.path, "r", encoding="utf-8") as f:
+            lines = (line for line in f if line.strip())
+            return [BoundaryEvent(**json.loads(line)) for line in islice(lines, n)]
 
     def read_all(self) -> List[BoundaryEvent]:
         """Read all events (for diagnostics / tests)."""
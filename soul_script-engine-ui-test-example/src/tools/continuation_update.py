@@ -3,14 +3,20 @@
 Backed by: data/{profile}_continuation.md (one file per profile, never more).
 """
 
+import functools
 import os
-import re
+import string
 import time
 from typing import Optional
 
+import src.data_paths as data_paths
 from src.data_paths import continuation_path as _continuation_path, profile_dir
 
-_SAFE_NAME = re.compile(r"^[a-zA-Z0-9_-]+$")
+_SAFE_NAME_CHARS = frozenset(string.ascii_letters + string.digits + "_-")
+
+
+def _is_safe_name(name: str) -> bool:
+    return bool(name) and _SAFE_NAME_CHARS.issuperset(name)
 
 
 def _ensure_dir() -> None:
@@ -21,6 +27,18 @@ def _file_for(profile: str) -> str:
     return _continuation_path(profile)
 
 
+# DATA_ROOT is resolved once per distinct value; only the per-call target
+# needs realpath().
+_real_root = functools.lru_cache(maxsize=8)(os.path.realpath)
+
+
+def _escapes_data_root(profile: str) -> bool:
+    """True if *profile*'s file resolves (e.g. via a symlink) outside data/."""
+    root = _real_root(data_paths.DATA_ROOT)
+    target = os.path.realpath(os.path.join(root, profile, "continuation.md"))
+    return os.path.commonpath([target, root]) != root
+
+
 class ContinuationUpdateTool:
     """Writes or updates a single per-profile continuation markdown file."""
 
@@ -65,11 +83,14 @@ class ContinuationUpdateTool:
         content = arguments.get("content", "")
         section = arguments.get("section", "")
 
-        if not _SAFE_NAME.match(profile):
+        if not _is_safe_name(profile):
             return f"Error: invalid profile name '{profile}'"
         if not content.strip():
             return "Error: 'content' must not be empty."
 
+        if _escapes_data_root(profile):
+            return f"Error: profile '{profile}' resolves outside the data directory."
+
         _ensure_dir()
         path = _file_for(profile)
 
@@ -92,6 +113,22 @@ def _mode_append(path: str, content: str) -> str:
     return f"Appended timestamped block to {path}"
 
 
+def _find_heading_line(text: str, heading: str) -> int:
+    """Index in *text* of a line that is *heading* plus optional trailing
+    whitespace, or -1."""
+    hay = "\n" + text
+    needle = "\n" + heading
+    pos = hay.find(needle)
+    while pos >= 0:
+        i = pos + len(needle)
+        while i < len(hay) and hay[i] in " \t\r\f\v":
+            i += 1
+        if i < len(hay) and hay[i] == "\n":
+            return pos  # hay[pos] is the "\n" before text[pos]
+        pos = hay.find(needle, pos + 1)
+    return -1
+
+
 def _mode_replace_section(path: str, content: str, section: str) -> str:
     heading = f"## {section}"
     new_block = f"{heading}\n\n{content.strip()}\n"
@@ -101,14 +138,14 @@ def _mode_replace_section(path: str, content: str, section: str) -> str:
         with open(path, "r", encoding="utf-8") as f:
             existing = f.read()
 
-    # Find and replace the section if it exists
-    pattern = re.compile(
-        r"^(## " + re.escape(section) + r")\s*\n(.*?)(?=\n## |\Z)",
-        re.MULTILINE | re.DOTALL,
-    )
-    match = pattern.search(existing)
+    # Find the section's span: its heading line up to the next heading (or
+    # EOF).  Searching from a leading "\n" also matches a heading on line 1.
+    start = _find_heading_line(existing, heading)
+    match = start >= 0
     if match:
-        updated = existing[: match.start()] + new_block + existing[match.end():]
+        end = existing.find("\n## ", start + len(heading))
+        end = len(existing) if end < 0 else end
+        updated = existing[:start] + new_block + existing[end:]
     else:
         # Append new section at the end
         updated = existing.rstrip("\n") + "\n\n" + new_block if existing.strip() else new_block
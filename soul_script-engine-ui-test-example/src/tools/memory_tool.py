@@ -11,13 +11,71 @@ Each memory can be individually viewed and deleted.
 """
 
 import json
-from typing import Any, Dict, List
+from operator import attrgetter
+from typing import Any, Dict, Iterable, Iterator, List
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
 
 from src.memory.faiss_memory import FAISSMemory
 from src.memory.types import VALID_CATEGORIES, VALID_SCOPES, VALID_SOURCES
 from src.data_paths import vault_path as _get_vault_path, faiss_dir as _get_faiss_dir
 
 
+def _dumps(obj: Any) -> str:
+    """Encode a tool response.
+
+    Every response goes through here or :func:`_list_response`, which
+    uses the same encoder, so all actions produce the same JSON style.
+    """
+    if orjson is None:
+        return json.dumps(obj)
+    return orjson.dumps(obj).decode()
+
+
+# Pre-serialized response for a search against an empty vault.
+_EMPTY_RESULT = _dumps({"status": "ok", "count": 0, "memories": []})
+
+# Fields exposed to agents, in output order.  ``attrgetter`` fetches them
+# all in one C-level call per memory.
+_FMT_FIELDS = (
+    "id", "text", "scope", "category", "tier",
+    "tags", "source", "created_at", "version",
+)
+_fmt_values = attrgetter(*_FMT_FIELDS)
+
+
+def _iter_fmt(memories: Iterable) -> Iterator[Dict[str, Any]]:
+    """Yield Memory records formatted for JSON output."""
+    for m in memories:
+        d = dict(zip(_FMT_FIELDS, _fmt_values(m)))
+        if m.topic_id:
+            d["topic_id"] = m.topic_id
+        yield d
+
+
+def _fmt_many(memories: Iterable) -> List[Dict[str, Any]]:
+    """Format a batch of Memory records for JSON output."""
+    return list(_iter_fmt(memories))
+
+
+def _list_response(items: Iterable[Dict[str, Any]], count: int, **extra) -> str:
+    """Build ``{"status": "ok", "count": ..., **extra, "memories": [...]}``.
+
+    With orjson the items are encoded one by one straight into the
+    output, so no intermediate list of dicts is kept around.
+    """
+    if orjson is None:
+        return _dumps({
+            "status": "ok", "count": count, **extra, "memories": list(items),
+        })
+    head = orjson.dumps({"status": "ok", "count": count, **extra})[:-1]
+    body = b",".join(map(orjson.dumps, items))
+    return (head + b',"memories":[' + body + b"]}").decode()
+
+
 class MemoryTool:
     """Tool exposing FAISS-backed memory operations to agents."""
 
@@ -131,10 +189,10 @@ class MemoryTool:
                 "rebuild_index": self._rebuild_index,
             }.get(action)
             if handler is None:
-                return json.dumps({"status": "error", "message": f"Unknown action '{action}'"})
+                return _dumps({"status": "error", "message": f"Unknown action '{action}'"})
             return handler(arguments)
         except (ValueError, KeyError) as exc:
-            return json.dumps({"status": "error", "message": str(exc)})
+            return _dumps({"status": "error", "message": str(exc)})
 
     # ------------------------------------------------------------------
     # Action handlers
@@ -145,11 +203,11 @@ class MemoryTool:
         scope = args.get("scope", "")
         category = args.get("category", "")
         if not text:
-            return json.dumps({"status": "error", "message": "text is required"})
+            return _dumps({"status": "error", "message": "text is required"})
         if not scope:
-            return json.dumps({"status": "error", "message": "scope is required"})
+            return _dumps({"status": "error", "message": "scope is required"})
         if not category:
-            return json.dumps({"status": "error", "message": "category is required"})
+            return _dumps({"status": "error", "message": "category is required"})
 
         mem = self._get_mem().add(
             text=text,
@@ -160,7 +218,7 @@ class MemoryTool:
             tier=args.get("tier", "register"),
             topic_id=args.get("topic_id"),
         )
-        return json.dumps({
+        return _dumps({
             "status": "stored",
             "id": mem.id,
             "scope": mem.scope,
@@ -170,7 +228,7 @@ class MemoryTool:
     def _remember(self, args: Dict[str, Any]) -> str:
         text = args.get("text", "")
         if not text:
-            return json.dumps({"status": "error", "message": "text is required"})
+            return _dumps({"status": "error", "message": "text is required"})
 
         result = self._get_mem().remember(
             text=text,
@@ -179,51 +237,48 @@ class MemoryTool:
             source=args.get("source", "tool"),
             tags=args.get("tags"),
         )
-        return json.dumps(result)
+        return _dumps(result)
 
     def _search(self, args: Dict[str, Any]) -> str:
         query = args.get("query", "")
         if not query:
-            return json.dumps({"status": "error", "message": "query is required"})
+            return _dumps({"status": "error", "message": "query is required"})
 
-        results = self._get_mem().search(
+        mem = self._get_mem()
+        if mem.size() == 0:
+            return _EMPTY_RESULT
+        results = mem.search(
             query=query,
             scope=args.get("scope"),
             category=args.get("category"),
             top_k=args.get("limit", 10),
         )
-        return json.dumps({
-            "status": "ok",
-            "count": len(results),
-            "memories": results,
-        })
+        return _list_response(results, len(results))
 
     def _recall(self, args: Dict[str, Any]) -> str:
+        # Reads the vault, not the index: no size() short-circuit here, as
+        # the vault may hold records written since this index was loaded.
         memories = self._get_mem().recall(
             scope=args.get("scope"),
             category=args.get("category"),
             tags=args.get("tags"),
             limit=args.get("limit", 20),
         )
-        return json.dumps({
-            "status": "ok",
-            "count": len(memories),
-            "memories": [self._fmt(m) for m in memories],
-        })
+        return _list_response(_iter_fmt(memories), len(memories))
 
     def _get(self, args: Dict[str, Any]) -> str:
         memory_id = args.get("memory_id", "")
         if not memory_id:
-            return json.dumps({"status": "error", "message": "memory_id is required"})
+            return _dumps({"status": "error", "message": "memory_id is required"})
         mem = self._get_mem().get(memory_id)
         if mem is None:
-            return json.dumps({"status": "not_found"})
-        return json.dumps({"status": "ok", "memory": self._fmt(mem)})
+            return _dumps({"status": "not_found"})
+        return _dumps({"status": "ok", "memory": self._fmt(mem)})
 
     def _update(self, args: Dict[str, Any]) -> str:
         memory_id = args.get("memory_id", "")
         if not memory_id:
-            return json.dumps({"status": "error", "message": "memory_id is required"})
+            return _dumps({"status": "error", "message": "memory_id is required"})
 
         new_ver = self._get_mem().update(
             memory_id,
@@ -231,7 +286,7 @@ class MemoryTool:
             category=args.get("category"),
             tags=args.get("tags"),
         )
-        return json.dumps({
+        return _dumps({
             "status": "updated",
             "id": new_ver.id,
             "version": new_ver.version,
@@ -240,56 +295,33 @@ class MemoryTool:
     def _delete(self, args: Dict[str, Any]) -> str:
         memory_id = args.get("memory_id", "")
         if not memory_id:
-            return json.dumps({"status": "error", "message": "memory_id is required"})
+            return _dumps({"status": "error", "message": "memory_id is required"})
         ok = self._get_mem().delete(memory_id)
-        return json.dumps({"status": "deleted" if ok else "not_found"})
+        return _dumps({"status": "deleted" if ok else "not_found"})
 
     def _bulk_delete(self, args: Dict[str, Any]) -> str:
         memory_ids = args.get("memory_ids", [])
         if not memory_ids:
-            return json.dumps({"status": "error", "message": "memory_ids is required"})
+            return _dumps({"status": "error", "message": "memory_ids is required"})
         result = self._get_mem().bulk_delete(memory_ids)
-        return json.dumps({
-            "status": "ok",
-            "deleted_count": len(result["deleted"]),
-            "deleted": result["deleted"],
-            "not_found": result["not_found"],
-        })
+        return _dumps({"status": "ok", **result})
 
     def _list(self, args: Dict[str, Any]) -> str:
         memories = self._get_mem().list_all(scope=args.get("scope"))
-        limit = args.get("limit", 50)
-        return json.dumps({
-            "status": "ok",
-            "count": len(memories[:limit]),
-            "total": len(memories),
-            "memories": [self._fmt(m) for m in memories[:limit]],
-        })
+        page = memories[:args.get("limit", 50)]
+        return _list_response(_iter_fmt(page), len(page), total=len(memories))
 
     def _stats(self, args: Dict[str, Any]) -> str:
-        return json.dumps({"status": "ok", **self._get_mem().stats()})
+        return _dumps({"status": "ok", **self._get_mem().stats()})
 
     def _compact(self, args: Dict[str, Any]) -> str:
         result = self._get_mem().compact()
-        return json.dumps({"status": "ok", **result})
+        return _dumps({"status": "ok", **result})
 
     def _rebuild_index(self, args: Dict[str, Any]) -> str:
         result = self._get_mem().rebuild_index()
-        return json.dumps(result)
+        return _dumps(result)
 
     @staticmethod
     def _fmt(m) -> Dict[str, Any]:
-        d = {
-            "id": m.id,
-            "text": m.text,
-            "scope": m.scope,
-            "category": m.category,
-            "tier": m.tier,
-            "tags": m.tags,
-            "source": m.source,
-            "created_at": m.created_at,
-            "version": m.version,
-        }
-        if m.topic_id:
-            d["topic_id"] = m.topic_id
-        return d
+        return _fmt_many((m,))[0]
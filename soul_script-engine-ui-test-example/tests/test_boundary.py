@@ -149,11 +149,27 @@ def test_boundary_logger():
         check("line2 proposed_limits has require_approval",
               line2["proposed_limits"].get("require_approval") is True)
 
+        # count / head helpers
+        check("count returns 2", logger.count() == 2)
+        first = logger.head(1)
+        check("head(1) returns 1 event", len(first) == 1)
+        check("head(1)[0] is BoundaryEvent",
+              isinstance(first[0], BoundaryEvent))
+        check("head(1)[0] is first event",
+              first[0].requested_capability == "web.search")
+
         # read_all helper
         events = logger.read_all()
         check("read_all returns 2 events", len(events) == 2)
         check("read_all[0] is BoundaryEvent",
               isinstance(events[0], BoundaryEvent))
+
+        # Handle survives close() — next append reopens it
+        logger.close()
+        _, event3 = build_denial("shell.exec", "orion", tick_index=2)
+        logger.append(event3)
+        check("append after close reopens", logger.count() == 3)
+        logger.close()
     finally:
         shutil.rmtree(tmpdir)
 
@@ -166,6 +182,8 @@ def test_logger_empty_file():
         logger = BoundaryLogger(os.path.join(tmpdir, "empty.jsonl"))
         events = logger.read_all()
         check("read_all on missing file returns []", events == [])
+        check("count on missing file returns 0", logger.count() == 0)
+        check("head on missing file returns []", logger.head(5) == [])
     finally:
         shutil.rmtree(tmpdir)
 
@@ -197,6 +215,7 @@ def test_boundary_event_to_dict():
           f"missing: {required_keys - set(d.keys())}")
     check("tick_index == 5", d["tick_index"] == 5)
     check("risk_level high", d["risk_level"] == "high")
+    check("BoundaryEvent has no __dict__ (slots)", not hasattr(event, "__dict__"))
 
 
 # ==================================================================
@@ -190,6 +190,70 @@ def test_store_scoping():
     finally:
         shutil.rmtree(tmp, ignore_errors=True)
 
+# ------------------------------------------------------------------
+def test_store_ranking():
+    print("\n=== Store Ranking ===")
+    tmp = tempfile.mkdtemp()
+    try:
+        write_file(os.path.join(tmp, "shared.md"), """## Tie Two
+Both tie sections share these exact words.
+
+## Tokens Only
+Fox tracks lead brown leaves to quick water.
+
+## Animals
+The quick brown fox jumps over the lazy dog.
+
+## Tie One
+Both tie sections share these exact words.
+""")
+        store = DirectiveStore(tmp, scopes="shared")
+
+        results = store.search("quick brown fox")
+        check("phrase and token matches both found", len(results) == 2)
+        check("exact phrase beats shared tokens",
+              [s.heading for s in results] == ["Animals", "Tokens Only"])
+
+        ties = store.search("exact words")
+        check("ties keep file order",
+              [s.heading for s in ties] == ["Tie Two", "Tie One"])
+
+        check("unknown tokens return []", store.search("zebra quartz") == [])
+
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+# ------------------------------------------------------------------
+def test_store_cache():
+    print("\n=== Store Cache ===")
+    tmp = tempfile.mkdtemp()
+    try:
+        shared = os.path.join(tmp, "shared.md")
+        write_file(shared, SAMPLE_SHARED)
+
+        first = DirectiveStore(tmp, scopes=["shared", "orion"])
+        second = DirectiveStore(tmp, scopes=["shared", "orion"])
+        check("unchanged files reuse cached sections",
+              second.get_all()[0] is first.get_all()[0])
+        check("missing scope file loads nothing", len(second.get_all()) == 3)
+
+        write_file(shared, SAMPLE_SHARED + "\n## Late Addition\nAdded after the first load.\n")
+        rewritten = DirectiveStore(tmp, scopes=["shared", "orion"])
+        check("rewritten scope file invalidates cache",
+              rewritten.get_section("Late Addition") is not None
+              and rewritten.get_all()[0] is not first.get_all()[0])
+
+        write_file(os.path.join(tmp, "orion.md"), SAMPLE_ORION)
+        created = DirectiveStore(tmp, scopes=["shared", "orion"])
+        check("scope file created later is picked up",
+              created.get_section("Debug Protocol") is not None
+              and len(created.get_all()) == 6)
+
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
 
 # ------------------------------------------------------------------
 def test_injector():
@@ -507,6 +571,8 @@ if __name__ == "__main__":
     test_store_search()
     test_store_list_and_get()
     test_store_scoping()
+    test_store_ranking()
+    test_store_cache()
     test_injector()
     test_tool()
     test_scoring()
@@ -225,6 +225,46 @@ def test_active_entry_slots():
     except AttributeError:
         check("__slots__ enforced", True)
 
+def test_active_directives_thread_isolation():
+    print("\n=== ActiveDirectives: thread isolation ===")
+    import threading
+    ActiveDirectives.reset()
+    ActiveDirectives.record("Main", "main body", "shared")
+    seen = {}
+
+    def worker():
+        seen["before"] = ActiveDirectives.count()
+        ActiveDirectives.record("W1", "worker body", "orion")
+        ActiveDirectives.record("W2", "worker body", "orion")
+        seen["after"] = ActiveDirectives.count()
+
+    t = threading.Thread(target=worker)
+    t.start()
+    t.join()
+    check("worker starts empty", seen["before"] == 0)
+    check("worker sees its own entries", seen["after"] == 2)
+    check("main unaffected by worker", ActiveDirectives.ids() == [_heading_to_id("shared", "Main")])
+
+
+def test_active_directives_reset_context():
+    print("\n=== ActiveDirectives: reset is per-context ===")
+    import contextvars
+    ActiveDirectives.reset()
+    ActiveDirectives.record("H1", "body one", "shared")
+    ActiveDirectives.record("H2", "body two", "shared")
+
+    def in_copy():
+        inherited = ActiveDirectives.count()
+        ActiveDirectives.reset()
+        ActiveDirectives.record("Copy", "copy body", "orion")
+        return inherited, ActiveDirectives.count()
+
+    inherited, after = contextvars.copy_context().run(in_copy)
+    check("copied context inherits entries", inherited == 2)
+    check("reset + record in copy gives 1", after == 1)
+    check("reset in copy leaves caller's entries", ActiveDirectives.count() == 2)
+
+
 
 # ==================================================================
 # ==================================================================
@@ -394,6 +434,8 @@ if __name__ == "__main__":
     test_active_directives_ids()
     test_active_directives_summary()
     test_active_entry_slots()
+    test_active_directives_thread_isolation()
+    test_active_directives_reset_context()
 
     # validate_manifest tests
     test_validate_manifest_valid()
@@ -4,6 +4,8 @@ Run from project root:
     python -m tests.test_memory
 """
 
+import atexit
+import itertools
 import json
 import os
 import shutil
@@ -16,33 +18,63 @@ from src.memory.vault import VaultStore, MemoryVault
 from src.memory.types import Memory, VALID_SCOPES, VALID_TIERS, VALID_CATEGORIES, VALID_SOURCES
 from src.memory.pii_guard import check_pii
 
-PASS = 0
-FAIL = 0
+# (passed, label) per check, in order.  Lines are written out in one go
+# by _report() after each test rather than printed per check.
+_RESULTS: list[tuple[bool, str]] = []
+_reported = 0
 
 
 def check(label, condition):
-    global PASS, FAIL
-    if condition:
-        PASS += 1
-        print(f"  [PASS] {label}")
-    else:
-        FAIL += 1
-        print(f"  [FAIL] {label}")
+    _RESULTS.append((bool(condition), label))
+
+
+def _report():
+    """Write the check lines buffered since the last report."""
+    global _reported
+    pending = _RESULTS[_reported:]
+    _reported = len(_RESULTS)
+    if pending:
+        sys.stdout.write("".join(
+            f"  [{'PASS' if ok else 'FAIL'}] {label}\n" for ok, label in pending
+        ))
+
+
+# One temp dir for the whole run; each vault gets its own file in it.
+_SESSION_TMP = tempfile.mkdtemp()
+_counter = itertools.count()
+
+
+@atexit.register
+def _remove_session_tmp():
+    # Normally empty by now (see _cleanup); rmtree only if something was left.
+    try:
+        os.rmdir(_SESSION_TMP)
+    except OSError:
+        shutil.rmtree(_SESSION_TMP, ignore_errors=True)
+
+
+def _vault_path():
+    return os.path.join(_SESSION_TMP, f"vault_{next(_counter)}.jsonl")
 
 
-def make_vault(tmp_dir=None):
-    """Create a VaultStore pointed at a temp directory."""
-    if tmp_dir is None:
-        tmp_dir = tempfile.mkdtemp()
-    path = os.path.join(tmp_dir, "vault.jsonl")
-    return VaultStore(path), tmp_dir
+def make_vault(**kwargs):
+    """Create a VaultStore on a fresh file in the session temp dir."""
+    return VaultStore(_vault_path(), **kwargs)
+
+
+def _cleanup(vault):
+    """Remove *vault*'s file - a single unlink, no tree walk."""
+    try:
+        os.unlink(vault.path)
+    except FileNotFoundError:
+        pass
 
 
 # ------------------------------------------------------------------
 def test_create_and_read():
     """Basic create_memory + read_active round-trip."""
     print("\n=== Create & Read ===")
-    vault, tmp = make_vault()
+    vault = make_vault()
     try:
         mem = vault.create_memory("Creator likes black coffee", "shared", "preference")
         check("create returns Memory", isinstance(mem, Memory))
@@ -67,13 +99,13 @@ def test_create_and_read():
         missing = vault.get_memory("nonexistent")
         check("get_memory missing returns None", missing is None)
     finally:
-        shutil.rmtree(tmp, ignore_errors=True)
+        _cleanup(vault)
 
 
 def test_scoping():
     """Memories respect scope assignment."""
     print("\n=== Scoping ===")
-    vault, tmp = make_vault()
+    vault = make_vault()
     try:
         vault.create_memory("Shared fact", "shared", "bio")
         vault.create_memory("Astraea fact", "astraea", "identity")
@@ -87,13 +119,13 @@ def test_scoping():
         check("astraea scope present", "astraea" in scopes)
         check("callum scope present", "callum" in scopes)
     finally:
-        shutil.rmtree(tmp, ignore_errors=True)
+        _cleanup(vault)
 
 
 def test_pii_guard():
     """PII detection blocks memory creation."""
     print("\n=== PII Guard ===")
-    vault, tmp = make_vault()
+    vault = make_vault()
     try:
         # SSN pattern
         blocked = False
@@ -138,13 +170,13 @@ def test_pii_guard():
         clean = check_pii("Normal conversation text")
         check("check_pii clean text", len(clean) == 0)
     finally:
-        shutil.rmtree(tmp, ignore_errors=True)
+        _cleanup(vault)
 
 
 def test_update():
     """update_memory appends new version."""
     print("\n=== Update ===")
-    vault, tmp = make_vault()
+    vault = make_vault()
     try:
         mem = vault.create_memory("Original text", "shared", "preference")
 
@@ -201,13 +233,13 @@ def test_update():
             empty_blocked = True
         check("update with empty text blocked", empty_blocked)
     finally:
-        shutil.rmtree(tmp, ignore_errors=True)
+        _cleanup(vault)
 
 
 def test_delete():
     """delete_memory soft-deletes with tombstone."""
     print("\n=== Delete ===")
-    vault, tmp = make_vault()
+    vault = make_vault()
     try:
         m1 = vault.create_memory("Memory one", "shared", "bio")
         m2 = vault.create_memory("Memory two", "shared", "preference")
@@ -237,13 +269,13 @@ def test_delete():
         check("deleted memory in resolved", m1.id in resolved)
         check("tombstone has deleted_at", resolved[m1.id].deleted_at is not None)
     finally:
-        shutil.rmtree(tmp, ignore_errors=True)
+        _cleanup(vault)
 
 
 def test_bulk_delete():
     """bulk_delete handles multiple IDs."""
     print("\n=== Bulk Delete ===")
-    vault, tmp = make_vault()
+    vault = make_vault()
     try:
         m1 = vault.create_memory("Memory A", "shared", "bio")
         m2 = vault.create_memory("Memory B", "shared", "preference")
@@ -257,13 +289,13 @@ def test_bulk_delete():
         check("1 active remains", len(active) == 1)
         check("survivor is B", active[0].text == "Memory B")
     finally:
-        shutil.rmtree(tmp, ignore_errors=True)
+        _cleanup(vault)
 
 
 def test_resolve_latest():
     """resolve_latest deduplicates multi-version records."""
     print("\n=== Resolve Latest ===")
-    vault, tmp = make_vault()
+    vault = make_vault()
     try:
         mem = vault.create_memory("v1", "shared", "bio")
         vault.update_memory(mem.id, text="v2")
@@ -278,13 +310,13 @@ def test_resolve_latest():
         raw = vault.read_all()
         check("3 raw lines total", len(raw) == 3)
     finally:
-        shutil.rmtree(tmp, ignore_errors=True)
+        _cleanup(vault)
 
 
 def test_compact():
     """compact() rewrites vault to active-only."""
     print("\n=== Compact ===")
-    vault, tmp = make_vault()
+    vault = make_vault()
     try:
         m1 = vault.create_memory("Keep this", "shared", "bio")
         m2 = vault.create_memory("Delete this", "shared", "meta")
@@ -308,13 +340,13 @@ def test_compact():
         raw = vault.read_all()
         check("1 raw line after compact", len(raw) == 1)
     finally:
-        shutil.rmtree(tmp, ignore_errors=True)
+        _cleanup(vault)
 
 
 def test_stats():
     """stats() returns correct counts and breakdowns."""
     print("\n=== Stats ===")
-    vault, tmp = make_vault()
+    vault = make_vault()
     try:
         vault.create_memory("Bio fact", "shared", "bio")
         vault.create_memory("Identity", "astraea", "identity")
@@ -333,13 +365,13 @@ def test_stats():
         check("by_tier has canon", s["by_tier"].get("canon", 0) == 2)
         check("by_tier has register", s["by_tier"].get("register", 0) == 1)
     finally:
-        shutil.rmtree(tmp, ignore_errors=True)
+        _cleanup(vault)
 
 
 def test_empty_vault():
     """Operations on empty vault behave correctly."""
     print("\n=== Empty Vault ===")
-    vault, tmp = make_vault()
+    vault = make_vault()
     try:
         check("read_all empty", vault.read_all() == [])
         check("read_active empty", vault.read_active() == [])
@@ -355,7 +387,7 @@ def test_empty_vault():
         result = vault.bulk_delete(["a", "b"])
         check("bulk_delete all not_found", len(result["not_found"]) == 2)
     finally:
-        shutil.rmtree(tmp, ignore_errors=True)
+        _cleanup(vault)
 
 
 def test_memory_dataclass():
@@ -397,6 +429,17 @@ def test_memory_dataclass():
     check("missing tier defaults canon", old.tier == "canon")
     check("missing version defaults 1", old.version == 1)
 
+    # Versioned but partial line (hand-edited): other fields still default
+    partial = Memory.from_dict(dict(d_old, version=2, tier="register"))
+    check("partial line loads with defaults",
+          partial.tags == [] and partial.created_at == ""
+          and partial.updated_at is None and partial.deleted_at is None)
+
+    # Slotted record; low-cardinality fields are interned on load
+    check("Memory has no __dict__ (slots)", not hasattr(mem, "__dict__"))
+    other = Memory.from_dict(dict(d_old, id="old2", category="".join(["b", "io"])))
+    check("from_dict interns category", other.category is old.category)
+
     # is_active
     check("active when no deleted_at", mem.is_active())
     deleted = Memory(id="d1", text="x", scope="shared", category="bio", deleted_at="2025-01-01")
@@ -420,7 +463,7 @@ def test_validation_constants():
 def test_tiers_and_topics():
     """Tier and topic_id are stored correctly."""
     print("\n=== Tiers & Topics ===")
-    vault, tmp = make_vault()
+    vault = make_vault()
     try:
         # Canon tier (default)
         m1 = vault.create_memory("Canon fact", "shared", "bio")
@@ -444,13 +487,13 @@ def test_tiers_and_topics():
         check("topic update preserves topic_id", updated.topic_id == "project-soulscript")
         check("topic update changes text", updated.text == "SoulScript v2")
     finally:
-        shutil.rmtree(tmp, ignore_errors=True)
+        _cleanup(vault)
 
 
 def test_tags_and_source():
     """Tags and source fields round-trip correctly."""
     print("\n=== Tags & Source ===")
-    vault, tmp = make_vault()
+    vault = make_vault()
     try:
         mem = vault.create_memory(
             "Tagged memory",
@@ -473,13 +516,13 @@ def test_tags_and_source():
         # Default tags
         check("default tags is empty list", m2.tags == [])
     finally:
-        shutil.rmtree(tmp, ignore_errors=True)
+        _cleanup(vault)
 
 
 def test_create_validation():
     """create_memory validates inputs."""
     print("\n=== Create Validation ===")
-    vault, tmp = make_vault()
+    vault = make_vault()
     try:
         # Empty text
         empty_err = False
@@ -505,13 +548,13 @@ def test_create_validation():
         mem2 = vault.create_memory("Test2", "shared", "BIO")
         check("category lowercased", mem2.category == "bio")
     finally:
-        shutil.rmtree(tmp, ignore_errors=True)
+        _cleanup(vault)
 
 
 def test_jsonl_format():
     """Vault file is valid JSONL."""
     print("\n=== JSONL Format ===")
-    vault, tmp = make_vault()
+    vault = make_vault()
     try:
         vault.create_memory("Line one", "shared", "bio")
         vault.create_memory("Line two", "shared", "preference")
@@ -530,7 +573,101 @@ def test_jsonl_format():
         check("first has text", "text" in parsed[0])
         check("first has scope", "scope" in parsed[0])
     finally:
-        shutil.rmtree(tmp, ignore_errors=True)
+        _cleanup(vault)
+
+
+def test_flush():
+    """A buffered store holds appends until flush() or the next read."""
+    print("\n=== Flush ===")
+    real_fsync = os.fsync
+    synced = []
+    os.fsync = lambda fd: (synced.append(fd), real_fsync(fd))
+    direct = make_vault()
+    try:
+        direct.create_memory("Written through", "shared", "bio")
+        with open(direct.path, "r", encoding="utf-8") as f:
+            check("unbuffered store writes at once", len(f.readlines()) == 1)
+        check("unbuffered write does not fsync", not synced)
+    finally:
+        os.fsync = real_fsync
+        _cleanup(direct)
+
+    vault = make_vault(buffered=True)
+    try:
+        vault.create_memory("Buffered one", "shared", "bio")
+        vault.create_memory("Buffered two", "shared", "bio")
+        check("nothing written before flush", not os.path.exists(vault.path))
+
+        os.fsync = lambda fd: (synced.append(fd), real_fsync(fd))
+        try:
+            vault.flush()
+        finally:
+            os.fsync = real_fsync
+        check("explicit flush fsyncs", len(synced) == 1)
+        with open(vault.path, "r", encoding="utf-8") as f:
+            check("flush writes both lines", len(f.readlines()) == 2)
+
+        vault.flush()
+        with open(vault.path, "r", encoding="utf-8") as f:
+            check("second flush is a no-op", len(f.readlines()) == 2)
+
+        vault.create_memory("Buffered three", "shared", "bio")
+        check("read drains pending appends", len(vault.read_active()) == 3)
+    finally:
+        vault.flush()
+        _cleanup(vault)
+
+
+def test_concurrent_writers():
+    """Threads sharing one store neither lose nor duplicate records."""
+    print("\n=== Concurrent Writers ===")
+    import threading
+
+    for buffered in (False, True):
+        vault = make_vault(buffered=buffered)
+        ids = [[], []]
+
+        def writer(out):
+            for i in range(300):
+                out.append(vault.create_memory(f"Concurrent {i}", "shared", "bio").id)
+                vault.flush()
+
+        try:
+            threads = [threading.Thread(target=writer, args=(out,)) for out in ids]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            vault.flush()
+            with open(vault.path, "r", encoding="utf-8") as f:
+                on_disk = [json.loads(l)["id"] for l in f if l.strip()]
+            label = "buffered" if buffered else "unbuffered"
+            check(f"{label}: all 600 records written", len(on_disk) == 600)
+            check(f"{label}: no duplicate lines", len(set(on_disk)) == 600)
+            check(f"{label}: every created id on disk", set(on_disk) == set(ids[0] + ids[1]))
+        finally:
+            _cleanup(vault)
+
+
+def test_index_refresh():
+    """The in-memory index picks up writes made through another store."""
+    print("\n=== Index Refresh ===")
+    vault = make_vault()
+    try:
+        m1 = vault.create_memory("Seen by both", "shared", "bio")
+        check("first store sees its own write", vault.get_memory(m1.id) is not None)
+
+        other = VaultStore(vault.path)
+        check("second store loads existing record", other.get_memory(m1.id) is not None)
+
+        m2 = other.create_memory("Written elsewhere", "shared", "bio")
+        other.delete_memory(m1.id)
+        other.flush()
+        check("first store sees outside create", vault.get_memory(m2.id) is not None)
+        check("first store sees outside delete", vault.get_memory(m1.id) is None)
+        check("active count reflects both stores", len(vault.read_active()) == 1)
+    finally:
+        _cleanup(vault)
 
 
 def test_backward_compat_alias():
@@ -539,40 +676,49 @@ def test_backward_compat_alias():
     check("MemoryVault is VaultStore", MemoryVault is VaultStore)
 
     # Can instantiate via alias
-    tmp = tempfile.mkdtemp()
+    vault = MemoryVault(_vault_path())
     try:
-        path = os.path.join(tmp, "vault.jsonl")
-        vault = MemoryVault(path)
         mem = vault.create_memory("Via alias", "shared", "bio")
         check("alias create works", isinstance(mem, Memory))
         check("alias read works", len(vault.read_active()) == 1)
     finally:
-        shutil.rmtree(tmp, ignore_errors=True)
+        _cleanup(vault)
 
 
 # ------------------------------------------------------------------
 if __name__ == "__main__":
-    test_create_and_read()
-    test_scoping()
-    test_pii_guard()
-    test_update()
-    test_delete()
-    test_bulk_delete()
-    test_resolve_latest()
-    test_compact()
-    test_stats()
-    test_empty_vault()
-    test_memory_dataclass()
-    test_validation_constants()
-    test_tiers_and_topics()
-    test_tags_and_source()
-    test_create_validation()
-    test_jsonl_format()
-    test_backward_compat_alias()
+    for test in (
+        test_create_and_read,
+        test_scoping,
+        test_pii_guard,
+        test_update,
+        test_delete,
+        test_bulk_delete,
+        test_resolve_latest,
+        test_compact,
+        test_stats,
+        test_empty_vault,
+        test_memory_dataclass,
+        test_validation_constants,
+        test_tiers_and_topics,
+        test_tags_and_source,
+        test_create_validation,
+        test_jsonl_format,
+        test_flush,
+        test_concurrent_writers,
+        test_index_refresh,
+        test_backward_compat_alias,
+    ):
+        try:
+            test()
+        finally:
+            _report()
 
+    passed = sum(ok for ok, _ in _RESULTS)
+    failed = len(_RESULTS) - passed
     print(f"\n{'=' * 40}")
-    print(f"Results: {PASS} passed, {FAIL} failed")
-    if FAIL == 0:
+    print(f"Results: {passed} passed, {failed} failed")
+    if failed == 0:
         print("All tests passed.")
     else:
         sys.exit(1)
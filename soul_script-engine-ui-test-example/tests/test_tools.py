@@ -96,6 +96,19 @@ def test_continuation_update():
         check("old status replaced", content.count("## Status") == 1,
               f"found {content.count('## Status')} occurrences")
 
+        # A heading line with trailing whitespace still matches
+        with open(path, "a") as f:
+            f.write("\n## Goals \t\nShip it.\n")
+        r4b = tool.execute({
+            "profile": "orion", "mode": "replace_section",
+            "section": "Goals", "content": "Shipped."
+        })
+        with open(path, "r") as f:
+            content = f.read()
+        check("trailing-space heading replaced",
+              "Replaced" in r4b and content.count("## Goals") == 1
+              and "Ship it." not in content, r4b)
+
         # Different profile -> separate file
         r5 = tool.execute({
             "profile": "elysia", "mode": "append", "content": "Hello from elysia."
@@ -109,6 +122,24 @@ def test_continuation_update():
         })
         check("path traversal blocked", "Error" in r6, r6)
 
+        # Symlinked profile dir pointing outside data/ is blocked too
+        outside = tempfile.mkdtemp()
+        try:
+            os.symlink(outside, os.path.join(tmp_dir, "sneaky"))
+            r6b = tool.execute({
+                "profile": "sneaky", "mode": "append", "content": "bad"
+            })
+            check("symlink escape blocked",
+                  "Error" in r6b and not os.listdir(outside), r6b)
+        finally:
+            shutil.rmtree(outside, ignore_errors=True)
+
+        # execute is a staticmethod: callable on the class itself
+        r6c = ContinuationUpdateTool.execute({
+            "profile": "orion", "mode": "append", "content": "Via the class."
+        })
+        check("execute callable on class", "Appended" in r6c, r6c)
+
         # Missing content
         r7 = tool.execute({
             "profile": "orion", "mode": "append", "content": "  "
@@ -142,6 +173,110 @@ def test_policy():
     check("tool_failure_mode=stop", stop_policy.tool_failure_mode == "stop")
 
 
+# ─────────────────────────────────────────────
+# 4. Anthropic achat (mocked transport)
+# ─────────────────────────────────────────────
+def test_anthropic_achat():
+    print("\n=== Anthropic achat ===")
+    import asyncio
+    import functools
+    import httpx
+    import src.llm_client.anthropic_client as ac
+
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        body = json.loads(request.content)
+        return httpx.Response(200, json={
+            "model": body["model"],
+            "content": [{"type": "text", "text": body["messages"][-1]["content"]}],
+            "usage": {"input_tokens": 3, "output_tokens": 2},
+        })
+
+    orig_client = ac.httpx.AsyncClient
+    orig_key = os.environ.get("ANTHROPIC_API_KEY")
+    ac.httpx.AsyncClient = functools.partial(
+        orig_client, transport=httpx.MockTransport(handler))
+    os.environ["ANTHROPIC_API_KEY"] = "test-key"
+    try:
+        client = ac.AnthropicClient({"model": "claude-test"})
+
+        async def batch():
+            return await asyncio.gather(*(
+                client.achat([{"role": "user", "content": f"m{i}"}]) for i in range(3)
+            ))
+
+        replies = asyncio.run(batch())
+        check("achat returns parsed replies",
+              [r.content for r in replies] == ["m0", "m1", "m2"],
+              f"got: {[r.content for r in replies]!r}")
+        check("achat usage totals", replies[0].usage["total_tokens"] == 5)
+        check("achat sends api key header",
+              seen and seen[0].headers.get("x-api-key") == "test-key")
+
+        first = client._aclient
+        r = asyncio.run(client.achat([{"role": "user", "content": "again"}]))
+        check("achat on a new loop succeeds", r.content == "again", repr(r.content))
+        check("achat rebuilds client for a new loop",
+              client._aclient is not first and client._aclient is not None)
+        asyncio.run(client.aclose())
+        check("aclose releases client", client._aclient is None)
+    finally:
+        ac.httpx.AsyncClient = orig_client
+        if orig_key is None:
+            os.environ.pop("ANTHROPIC_API_KEY", None)
+        else:
+            os.environ["ANTHROPIC_API_KEY"] = orig_key
+
+
+# ─────────────────────────────────────────────
+# 5. Memory tool search (stub encoder)
+# ─────────────────────────────────────────────
+def test_memory_search():
+    print("\n=== Memory Tool Search ===")
+    import numpy as np
+    from src.memory.faiss_memory import FAISSMemory
+    from src.memory.vault import VaultStore
+    from src.tools.memory_tool import MemoryTool
+
+    class StubEncoder:
+        """Deterministic unit vectors; no model download."""
+        def encode(self, texts, **kwargs):
+            rows = []
+            for t in texts:
+                v = np.random.default_rng(sum(map(ord, t))).random(32)
+                rows.append(v / np.linalg.norm(v))
+            return np.asarray(rows, dtype="float32")
+
+    class StubMemory(FAISSMemory):
+        encoder = StubEncoder()
+        embedding_dim = 32
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        vault_path = os.path.join(tmp_dir, "vault.jsonl")
+        mem = StubMemory(vault_path, os.path.join(tmp_dir, "faiss"))
+        tool = MemoryTool()
+        tool._mem = mem
+
+        empty = json.loads(tool.execute({"action": "search", "query": "coffee"}))
+        check("empty vault: no results", empty["count"] == 0, empty)
+
+        mem.add("Creator likes coffee", scope="shared", category="preference")
+        # Written by another process, so never embedded into this index.
+        outside = VaultStore(vault_path).create_memory(
+            "Seeded elsewhere", "shared", "bio")
+        mem.delete(outside.id)
+        check("size counts live vault memories", mem.size() == 1, mem.size())
+
+        r = json.loads(tool.execute({"action": "search", "query": "coffee"}))
+        check("unindexed delete keeps search hits",
+              r["count"] == 1 and r["memories"][0]["text"] == "Creator likes coffee", r)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
 # ─────────────────────────────────────────────
 # Run all
 # ─────────────────────────────────────────────
@@ -149,6 +284,8 @@ if __name__ == "__main__":
     test_echo()
     test_continuation_update()
     test_policy()
+    test_anthropic_achat()
+    test_memory_search()
 
     print(f"\n{'='*40}")
     print(f"Results: {PASS} passed, {FAIL} failed")
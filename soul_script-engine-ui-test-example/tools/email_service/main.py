@@ -1,24 +1,57 @@
+import atexit
 import os
 import json
-import smtplib
+import logging
+import queue
+from contextlib import asynccontextmanager
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import List, Optional
+from logging.handlers import QueueHandler, QueueListener
+from typing import TYPE_CHECKING, List, Optional
 from pathlib import Path
 
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, validator
+from pydantic import BaseModel, TypeAdapter, ValidationError, model_validator
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
 
 # Import your Tools class from webui
 from webui import Tools
+import smtp_pool
+
+if TYPE_CHECKING:
+    from fastapi import FastAPI
 
-# Initialize FastAPI app
-app = FastAPI(title="Email Service", description="Local email sending service with multi-account support")
 
-# Initialize Tools instance with your config path
+def _setup_logging() -> None:
+    """
+    Route log records through a queue to a background writer thread.
+
+    Request handlers only enqueue records; formatting and the stderr write
+    happen on the listener's thread.  Set ``EMAIL_SERVICE_LOG_LEVEL=DEBUG``
+    to see per-send connection chatter.
+    """
+    root = logging.getLogger()
+    if any(isinstance(h, QueueHandler) for h in root.handlers):
+        return
+    records: queue.Queue = queue.Queue(-1)
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    listener = QueueListener(records, handler)
+    root.addHandler(QueueHandler(records))
+    root.setLevel(os.getenv("EMAIL_SERVICE_LOG_LEVEL", "INFO").upper())
+    listener.start()
+    atexit.register(listener.stop)
+
+
+# Blocking SMTP sends run in anyio's worker threads; the default limit of 40
+# would cap concurrent sends well below what a slow mail server needs.
+THREADPOOL_SIZE = 200
+
 _THIS_DIR = Path(__file__).resolve().parent
 CONFIG_PATH = str(_THIS_DIR / "email.env")
-tools = Tools(config_path=CONFIG_PATH)
 
 # Path to agent-runtime settings for account lookup
 _RUNTIME_SETTINGS = _THIS_DIR.parent.parent / "config" / "settings.json"
@@ -48,23 +81,36 @@ class EmailRequest(BaseModel):
     smtp_port: Optional[int] = None
     signature: Optional[str] = None
 
-    @validator('subject')
-    def subject_non_empty(cls, v):
-        if not v or not v.strip():
+    @model_validator(mode="after")
+    def _check_non_empty(self):
+        subject = self.subject.strip()
+        if not subject:
             raise ValueError('Subject cannot be empty')
-        return v.strip()
-
-    @validator('body')
-    def body_non_empty(cls, v):
-        if not v or not v.strip():
+        body = self.body.strip()
+        if not body:
             raise ValueError('Body cannot be empty')
-        return v.strip()
-
-    @validator('recipients')
-    def recipients_non_empty(cls, v):
-        if not v or len(v) == 0:
+        if not self.recipients:
             raise ValueError('Recipients list cannot be empty')
-        return v
+        self.subject = subject
+        self.body = body
+        return self
+
+
+# Built once at import; the routes validate raw request bytes through these
+# directly instead of going through FastAPI's per-route body resolution.
+_EMAIL_ADAPTER = TypeAdapter(EmailRequest)
+_EMAIL_LIST_ADAPTER = TypeAdapter(List[EmailRequest])
+
+
+def _body_schema(schema: dict) -> dict:
+    """``openapi_extra`` so /docs still shows a body the route parses itself."""
+    return {"requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": schema}},
+    }}
+
+
+_EMAIL_SCHEMA = EmailRequest.model_json_schema()
 
 
 def _send_with_credentials(
@@ -86,16 +132,8 @@ def _send_with_credentials(
     msg["Subject"] = subject
     msg.attach(MIMEText(full_body, "plain"))
 
-    if smtp_port == 587:
-        server = smtplib.SMTP(smtp_server, smtp_port, timeout=30)
-        server.ehlo()
-        server.starttls()
-    else:
-        server = smtplib.SMTP_SSL(smtp_server, smtp_port, timeout=30)
-
-    server.login(email_addr, password)
-    server.sendmail(email_addr, recipients, msg.as_string())
-    server.quit()
+    with smtp_pool.session(smtp_server, smtp_port, email_addr, password) as server:
+        server.send_message(msg, from_addr=email_addr, to_addrs=recipients)
 
     return {
         "status": "ok",
@@ -108,132 +146,254 @@ def _send_with_credentials(
     }
 
 
-@app.post("/send_email")
-async def send_email(email_request: EmailRequest):
-    """
-    Send email endpoint.  Supports:
-      1. Explicit credentials in the request body (from_email, password, smtp_*)
-      2. account_id referencing an agent-runtime saved account
-      3. Fallback to the .env configured account
-    """
+def _json_bytes(payload: dict) -> bytes:
+    """Encode *payload* exactly as the app's default response class would."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _settings_mtime() -> Optional[int]:
     try:
-        # Option 1: Explicit credentials in request
-        if email_request.from_email and email_request.password:
-            result = _send_with_credentials(
-                email_addr=email_request.from_email,
-                password=email_request.password,
-                smtp_server=email_request.smtp_server or "smtp.gmail.com",
-                smtp_port=email_request.smtp_port or 465,
-                subject=email_request.subject,
-                body=email_request.body,
-                recipients=email_request.recipients,
-                signature=email_request.signature or "",
-            )
-            return result
+        return os.stat(_RUNTIME_SETTINGS).st_mtime_ns
+    except OSError:
+        return None
 
-        # Option 2: account_id lookup from agent-runtime settings
-        if email_request.account_id:
-            accounts = _load_runtime_accounts()
-            acct = next((a for a in accounts if a.get("id") == email_request.account_id), None)
-            if not acct:
-                raise HTTPException(status_code=404, detail=f"Account {email_request.account_id} not found")
-            result = _send_with_credentials(
-                email_addr=acct["email"],
-                password=acct["password"],
-                smtp_server=acct.get("smtp_server", "smtp.gmail.com"),
-                smtp_port=int(acct.get("smtp_port", 465)),
-                subject=email_request.subject,
-                body=email_request.body,
-                recipients=email_request.recipients,
-                signature=acct.get("signature", ""),
-                display_name=acct.get("label", ""),
-            )
-            return result
 
-        # Option 3: Fallback to .env configured account via Tools class
-        result = tools.send_email(
-            subject=email_request.subject,
-            body=email_request.body,
-            recipients=email_request.recipients
-        )
-        if "successfully" in result.lower():
-            return {
-                "status": "ok",
-                "message": "Email sent successfully",
-                "details": {
-                    "subject": email_request.subject,
-                    "recipients": email_request.recipients,
-                    "result": result
-                }
-            }
-        else:
-            raise HTTPException(status_code=500, detail=f"Failed to send email: {result}")
+# /server-status body, rebuilt only when settings.json changes: (mtime, bytes)
+_server_status_cache: tuple = (object(), b"")
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
 
+def _server_status_body(tools: Tools) -> bytes:
+    global _server_status_cache
+    mtime = _settings_mtime()
+    if _server_status_cache[0] != mtime:
+        try:
+            has_credentials = tools._configured
+            accounts = _load_runtime_accounts()
+            payload = {
+                "server_configured": has_credentials or len(accounts) > 0,
+                "from_email": tools.valves.FROM_EMAIL if has_credentials else "Not configured",
+                "smtp_server": tools.valves.SMTP_SERVER,
+                "smtp_port": tools.valves.SMTP_PORT,
+                "using_tools_class": True,
+                "runtime_accounts": len(accounts),
+            }
+        except Exception as e:
+            payload = {
+                "server_configured": False,
+                "error": str(e),
+                "using_tools_class": True
+            }
+        _server_status_cache = (mtime, _json_bytes(payload))
+    return _server_status_cache[1]
 
-@app.get("/")
-async def root():
-    """Health check endpoint"""
-    return {"status": "Email service is running", "multi_account": True}
 
+def create_app() -> "FastAPI":
+    """
+    Build the FastAPI app and the .env-backed :class:`Tools` it sends with.
 
-@app.get("/server-status")
-async def server_status():
-    """Check server configuration"""
-    try:
-        has_credentials = bool(tools.valves.FROM_EMAIL and tools.valves.PASSWORD)
-        accounts = _load_runtime_accounts()
+    FastAPI, Starlette and anyio are imported here rather than at module
+    level, so importing this module for its helpers stays cheap.
+    """
+    import anyio.to_thread
+    from fastapi import FastAPI, HTTPException, Request, Response
+    from fastapi.exceptions import RequestValidationError
+    from fastapi.concurrency import run_in_threadpool
+    from fastapi.responses import JSONResponse, ORJSONResponse
+
+    _setup_logging()
+
+    # Initialize Tools instance with your config path
+    tools = Tools(config_path=CONFIG_PATH)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+        yield
+
+    # Initialize FastAPI app
+    app = FastAPI(
+        title="Email Service",
+        description="Local email sending service with multi-account support",
+        default_response_class=ORJSONResponse if orjson is not None else JSONResponse,
+        lifespan=lifespan,
+    )
+    app.state.tools = tools
+
+    async def parse_body(request: Request, adapter: TypeAdapter):
+        """Parse and validate the JSON body in one pass (pydantic-core)."""
+        try:
+            return adapter.validate_json(await request.body())
+        except ValidationError as e:
+            # Same 422 shape FastAPI gives for a declared body parameter.
+            raise RequestValidationError(
+                [{**err, "loc": ("body", *err["loc"])} for err in e.errors(include_url=False)]
+            )
 
+    @app.post("/send_email", response_model=None, openapi_extra=_body_schema(_EMAIL_SCHEMA))
+    async def send_email(request: Request):
+        """
+        Send email endpoint.  Supports:
+          1. Explicit credentials in the request body (from_email, password, smtp_*)
+          2. account_id referencing an agent-runtime saved account
+          3. Fallback to the .env configured account
+        """
+        email_request = await parse_body(request, _EMAIL_ADAPTER)
+        try:
+            # Option 1: Explicit credentials in request
+            if email_request.from_email and email_request.password:
+                result = await run_in_threadpool(
+                    _send_with_credentials,
+                    email_addr=email_request.from_email,
+                    password=email_request.password,
+                    smtp_server=email_request.smtp_server or "smtp.gmail.com",
+                    smtp_port=email_request.smtp_port or 465,
+                    subject=email_request.subject,
+                    body=email_request.body,
+                    recipients=email_request.recipients,
+                    signature=email_request.signature or "",
+                )
+                return result
+
+            # Option 2: account_id lookup from agent-runtime settings
+            if email_request.account_id:
+                accounts = _load_runtime_accounts()
+                acct = next((a for a in accounts if a.get("id") == email_request.account_id), None)
+                if not acct:
+                    raise HTTPException(status_code=404, detail=f"Account {email_request.account_id} not found")
+                result = await run_in_threadpool(
+                    _send_with_credentials,
+                    email_addr=acct["email"],
+                    password=acct["password"],
+                    smtp_server=acct.get("smtp_server", "smtp.gmail.com"),
+                    smtp_port=int(acct.get("smtp_port", 465)),
+                    subject=email_request.subject,
+                    body=email_request.body,
+                    recipients=email_request.recipients,
+                    signature=acct.get("signature", ""),
+                    display_name=acct.get("label", ""),
+                )
+                return result
+
+            # Option 3: Fallback to .env configured account via Tools class
+            result = await tools.send_email_async(
+                subject=email_request.subject,
+                body=email_request.body,
+                recipients=email_request.recipients
+            )
+            if "successfully" in result.lower():
+                return {
+                    "status": "ok",
+                    "message": "Email sent successfully",
+                    "details": {
+                        "subject": email_request.subject,
+                        "recipients": email_request.recipients,
+                        "result": result
+                    }
+                }
+            else:
+                raise HTTPException(status_code=500, detail=f"Failed to send email: {result}")
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+
+    @app.post(
+        "/send_bulk",
+        response_model=None,
+        openapi_extra=_body_schema({"type": "array", "items": _EMAIL_SCHEMA}),
+    )
+    async def send_bulk(request: Request):
+        """
+        Send several emails from the .env configured account over one SMTP
+        session.  Per-request account/credential fields are not used here.
+        """
+        email_requests = await parse_body(request, _EMAIL_LIST_ADAPTER)
+        results = await run_in_threadpool(
+            tools.send_bulk,
+            [(r.subject, r.body, r.recipients) for r in email_requests],
+        )
+        sent = sum(1 for result in results if "successfully" in result.lower())
         return {
-            "server_configured": has_credentials or len(accounts) > 0,
-            "from_email": tools.valves.FROM_EMAIL if has_credentials else "Not configured",
-            "smtp_server": tools.valves.SMTP_SERVER,
-            "smtp_port": tools.valves.SMTP_PORT,
-            "using_tools_class": True,
-            "runtime_accounts": len(accounts),
+            "status": "ok" if sent == len(results) else "partial" if sent else "error",
+            "sent": sent,
+            "failed": len(results) - sent,
+            "results": [
+                {"subject": r.subject, "recipients": r.recipients, "result": result}
+                for r, result in zip(email_requests, results)
+            ],
         }
-    except Exception as e:
+
+    @app.post("/send_each", response_model=None, openapi_extra=_body_schema(_EMAIL_SCHEMA))
+    async def send_each(request: Request):
+        """
+        Send a separate copy of one email to each recipient from the .env
+        configured account, so recipients don't see each other's addresses.
+        """
+        email_request = await parse_body(request, _EMAIL_ADAPTER)
+        results = await run_in_threadpool(
+            tools.send_each,
+            email_request.subject, email_request.body, email_request.recipients,
+        )
+        sent = sum(1 for result in results if "successfully" in result.lower())
         return {
-            "server_configured": False,
-            "error": str(e),
-            "using_tools_class": True
+            "status": "ok" if sent == len(results) else "partial" if sent else "error",
+            "sent": sent,
+            "failed": len(results) - sent,
+            "results": [
+                {"recipient": recipient, "result": result}
+                for recipient, result in zip(email_request.recipients, results)
+            ],
         }
 
+    @app.get("/")
+    async def root():
+        """Health check endpoint"""
+        return {"status": "Email service is running", "multi_account": True}
 
-@app.get("/accounts")
-async def list_accounts():
-    """List available accounts from agent-runtime settings."""
-    accounts = _load_runtime_accounts()
-    # Mask passwords
-    safe = []
-    for acct in accounts:
-        a = dict(acct)
-        a["password"] = "••••••••" if a.get("password") else ""
-        safe.append(a)
-    return {"accounts": safe, "total": len(safe)}
+    @app.get("/server-status")
+    async def server_status():
+        """Check server configuration"""
+        return Response(_server_status_body(tools), media_type="application/json")
 
+    @app.get("/accounts")
+    async def list_accounts():
+        """List available accounts from agent-runtime settings."""
+        accounts = _load_runtime_accounts()
+        # Mask passwords
+        safe = []
+        for acct in accounts:
+            a = dict(acct)
+            a["password"] = "••••••••" if a.get("password") else ""
+            safe.append(a)
+        return {"accounts": safe, "total": len(safe)}
+
+    # The .env config is fixed for the life of the process, so this is built once.
+    tools_status_body = _json_bytes({
+        "tools_initialized": True,
+        "from_email": tools.valves.FROM_EMAIL,
+        "smtp_server": tools.valves.SMTP_SERVER,
+        "smtp_port": tools.valves.SMTP_PORT,
+        "config_path": CONFIG_PATH
+    })
+
+    @app.get("/tools-status")
+    async def tools_status():
+        """Check Tools class configuration"""
+        return Response(tools_status_body, media_type="application/json")
+
+    return app
 
-@app.get("/tools-status")
-async def tools_status():
-    """Check Tools class configuration"""
-    try:
-        return {
-            "tools_initialized": True,
-            "from_email": tools.valves.FROM_EMAIL,
-            "smtp_server": tools.valves.SMTP_SERVER,
-            "smtp_port": tools.valves.SMTP_PORT,
-            "config_path": CONFIG_PATH
-        }
-    except Exception as e:
-        return {
-            "tools_initialized": False,
-            "error": str(e)
-        }
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="127.0.0.1", port=8000)
\ No newline at end of file
+    # Each worker is its own process with its own app, Tools and SMTP pool;
+    # uvicorn shares the listening socket between them.  Workers need the
+    # app as an import string so they can build it themselves.
+    workers = int(os.getenv("EMAIL_SERVICE_WORKERS", min(os.cpu_count() or 1, 4)))
+    uvicorn.run(
+        "main:create_app", factory=True, host="127.0.0.1", port=8000,
+        workers=workers,
+    )
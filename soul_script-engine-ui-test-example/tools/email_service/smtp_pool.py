@@ -0,0 +1,318 @@
+"""Thread-safe pool of authenticated SMTP connections.
+
+Opening an SMTP session costs a TCP connect, a TLS handshake and an AUTH
+round-trip - usually far more than sending the message itself.  This
+module keeps logged-in connections around, keyed by
+``(server, port, email, password)``, and hands them back out to later
+sends.
+
+    with smtp_pool.session(server, port, email, password) as smtp:
+        smtp.sendmail(email, recipients, msg.as_string())
+
+* Idle connections are checked with ``NOOP`` before reuse and replaced
+  transparently if the server has dropped them.
+* At most ``MAX_IDLE_PER_KEY`` idle connections are kept per account.
+* A background reaper closes connections idle longer than ``IDLE_TTL``.
+* A connection is retired after ``MAX_MESSAGES_PER_CONN`` messages or
+  ``MAX_CONN_AGE`` seconds, whichever comes first.
+* Every socket carries a ``CONNECT_TIMEOUT`` so a stalled server can't
+  hang a send.
+* Any exception inside a session discards that connection.
+
+``async_session`` is the asyncio counterpart, built on ``aiosmtplib``.
+It lets the FastAPI event loop run many sends at once without blocking.
+Its idle connections live in a per-account ``asyncio.Queue`` and
+expired ones are dropped when next acquired.
+"""
+
+import asyncio
+import atexit
+import queue
+import smtplib
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Dict, Iterator, Optional, Tuple
+
+try:
+    import aiosmtplib
+except ImportError:  # optional; callers fall back to the blocking pool
+    aiosmtplib = None
+
+MAX_IDLE_PER_KEY = 8
+IDLE_TTL = 100.0  # seconds
+MAX_MESSAGES_PER_CONN = 10_000
+MAX_CONN_AGE = 3600.0  # seconds
+CONNECT_TIMEOUT = 30  # seconds, for connect and every command
+
+_Key = Tuple[str, int, str, str]
+
+
+@dataclass(slots=True)
+class _PooledSMTP:
+    """An authenticated connection plus the bookkeeping the pool needs."""
+
+    conn: smtplib.SMTP
+    key: _Key
+    sent_count: int = 0
+    created_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+
+    def spent(self) -> bool:
+        """True once this connection should be retired rather than reused."""
+        return (self.sent_count >= MAX_MESSAGES_PER_CONN
+                or time.monotonic() - self.created_at > MAX_CONN_AGE)
+
+    def sendmail(self, from_addr, to_addrs, msg, *args, **kwargs):
+        result = self.conn.sendmail(from_addr, to_addrs, msg, *args, **kwargs)
+        self.sent_count += 1
+        return result
+
+    def send_message(self, msg, *args, **kwargs):
+        result = self.conn.send_message(msg, *args, **kwargs)
+        self.sent_count += 1
+        return result
+
+
+_SMTP_POOL: Dict[_Key, "queue.LifoQueue[_PooledSMTP]"] = {}
+_POOL_LOCK = threading.Lock()
+_reaper: Optional[threading.Thread] = None
+
+
+def _connect(key: _Key) -> _PooledSMTP:
+    server, port, email, password = key
+    if port == 587:
+        conn = smtplib.SMTP(server, port, timeout=CONNECT_TIMEOUT)
+        conn.ehlo()
+        conn.starttls()
+    else:
+        conn = smtplib.SMTP_SSL(server, port, timeout=CONNECT_TIMEOUT)
+    try:
+        conn.login(email, password)
+    except BaseException:
+        conn.close()
+        raise
+    return _PooledSMTP(conn, key)
+
+
+def _close(pooled: _PooledSMTP) -> None:
+    try:
+        pooled.conn.quit()
+    except (smtplib.SMTPException, OSError):
+        pass
+    finally:
+        pooled.conn.close()
+
+
+def _is_alive(pooled: _PooledSMTP) -> bool:
+    try:
+        return pooled.conn.noop()[0] == 250
+    except (smtplib.SMTPException, OSError):
+        return False
+
+
+def _queue_for(key: _Key) -> "queue.LifoQueue[_PooledSMTP]":
+    with _POOL_LOCK:
+        q = _SMTP_POOL.get(key)
+        if q is None:
+            q = _SMTP_POOL[key] = queue.LifoQueue(maxsize=MAX_IDLE_PER_KEY)
+        return q
+
+
+def acquire(server: str, port: int, email: str, password: str) -> _PooledSMTP:
+    """Return a live, logged-in connection - reused if one is idle."""
+    key = (server, port, email, password)
+    q = _queue_for(key)
+    while True:
+        try:
+            pooled = q.get_nowait()
+        except queue.Empty:
+            return _connect(key)
+        if _is_alive(pooled):
+            return pooled
+        _close(pooled)
+
+
+def release(pooled: _PooledSMTP) -> None:
+    """Return *pooled* to its idle queue, or close it if it is spent."""
+    if pooled.spent():
+        _close(pooled)
+        return
+    pooled.last_used = time.monotonic()
+    try:
+        _queue_for(pooled.key).put_nowait(pooled)
+    except queue.Full:
+        _close(pooled)
+        return
+    _ensure_reaper()
+
+
+@contextmanager
+def session(server: str, port: int, email: str, password: str) -> Iterator[_PooledSMTP]:
+    """Borrow a pooled connection for the duration of a ``with`` block."""
+    pooled = acquire(server, port, email, password)
+    try:
+        yield pooled
+    except BaseException:
+        _close(pooled)
+        raise
+    release(pooled)
+
+
+def _reap_idle() -> None:
+    cutoff = time.monotonic() - IDLE_TTL
+    with _POOL_LOCK:
+        queues = list(_SMTP_POOL.values())
+    for q in queues:
+        keep, stale = [], []
+        while True:
+            try:
+                pooled = q.get_nowait()
+            except queue.Empty:
+                break
+            (stale if pooled.last_used < cutoff else keep).append(pooled)
+        # Oldest first so the freshest ends up on top of the LIFO queue.
+        for pooled in reversed(keep):
+            try:
+                q.put_nowait(pooled)
+            except queue.Full:
+                stale.append(pooled)
+        for pooled in stale:
+            _close(pooled)
+
+
+def _reaper_loop() -> None:
+    while True:
+        time.sleep(IDLE_TTL / 2)
+        _reap_idle()
+
+
+def _ensure_reaper() -> None:
+    global _reaper
+    if _reaper is not None:
+        return
+    with _POOL_LOCK:
+        if _reaper is None:
+            _reaper = threading.Thread(
+                target=_reaper_loop, name="smtp-pool-reaper", daemon=True
+            )
+            _reaper.start()
+
+
+@atexit.register
+def close_all() -> None:
+    """Close every idle pooled connection."""
+    with _POOL_LOCK:
+        queues = list(_SMTP_POOL.values())
+    for q in queues:
+        while True:
+            try:
+                _close(q.get_nowait())
+            except queue.Empty:
+                break
+
+
+# ---- asyncio pool (aiosmtplib) ---------------------------------------------
+
+@dataclass(slots=True)
+class _PooledAsyncSMTP:
+    """An authenticated ``aiosmtplib.SMTP`` plus pool bookkeeping."""
+
+    conn: "aiosmtplib.SMTP"
+    key: _Key
+    sent_count: int = 0
+    created_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+
+    def spent(self) -> bool:
+        return (self.sent_count >= MAX_MESSAGES_PER_CONN
+                or time.monotonic() - self.created_at > MAX_CONN_AGE)
+
+    async def sendmail(self, sender, recipients, message, **kwargs):
+        result = await self.conn.sendmail(sender, recipients, message, **kwargs)
+        self.sent_count += 1
+        return result
+
+    async def send_message(self, msg, **kwargs):
+        result = await self.conn.send_message(msg, **kwargs)
+        self.sent_count += 1
+        return result
+
+
+_ASYNC_POOL: Dict[_Key, "asyncio.Queue[_PooledAsyncSMTP]"] = {}
+
+
+async def _aconnect(key: _Key) -> _PooledAsyncSMTP:
+    server, port, email, password = key
+    conn = aiosmtplib.SMTP(
+        hostname=server,
+        port=port,
+        use_tls=port != 587,
+        start_tls=port == 587,
+        timeout=CONNECT_TIMEOUT,
+    )
+    await conn.connect()
+    try:
+        await conn.login(email, password)
+    except BaseException:
+        conn.close()
+        raise
+    return _PooledAsyncSMTP(conn, key)
+
+
+async def _aclose(pooled: _PooledAsyncSMTP) -> None:
+    try:
+        await pooled.conn.quit()
+    except (aiosmtplib.SMTPException, OSError):
+        pass
+    finally:
+        pooled.conn.close()
+
+
+async def _ais_alive(pooled: _PooledAsyncSMTP) -> bool:
+    try:
+        return (await pooled.conn.noop()).code == 250
+    except (aiosmtplib.SMTPException, OSError):
+        return False
+
+
+async def aacquire(server: str, port: int, email: str, password: str) -> _PooledAsyncSMTP:
+    """Async :func:`acquire` - a live, logged-in ``aiosmtplib`` connection."""
+    key = (server, port, email, password)
+    q = _ASYNC_POOL.get(key)
+    if q is None:
+        q = _ASYNC_POOL[key] = asyncio.Queue(maxsize=MAX_IDLE_PER_KEY)
+    cutoff = time.monotonic() - IDLE_TTL
+    while not q.empty():
+        pooled = q.get_nowait()
+        if pooled.last_used >= cutoff and await _ais_alive(pooled):
+            return pooled
+        await _aclose(pooled)
+    return await _aconnect(key)
+
+
+async def arelease(pooled: _PooledAsyncSMTP) -> None:
+    """Async :func:`release`."""
+    if pooled.spent():
+        await _aclose(pooled)
+        return
+    pooled.last_used = time.monotonic()
+    try:
+        _ASYNC_POOL[pooled.key].put_nowait(pooled)
+    except asyncio.QueueFull:
+        await _aclose(pooled)
+
+
+@asynccontextmanager
+async def async_session(
+    server: str, port: int, email: str, password: str
+) -> AsyncIterator[_PooledAsyncSMTP]:
+    """Borrow a pooled ``aiosmtplib`` connection for an ``async with`` block."""
+    pooled = await aacquire(server, port, email, password)
+    try:
+        yield pooled
+    except BaseException:
+        await _aclose(pooled)
+        raise
+    await arelease(pooled)
@@ -1,27 +1,115 @@
+import asyncio
+import functools
+import io
+import logging
+import os
+import re
 import smtplib
+from dataclasses import dataclass, field
+from email.generator import BytesGenerator
+from email.message import EmailMessage
 from email.mime.text import MIMEText
-from typing import List, Optional
-
-from pydantic import BaseModel, Field
-
-
-class ToolsValves(BaseModel):
-    FROM_EMAIL: str = Field(
-        default="",
-        description="The email a LLM can use",
-    )
-    PASSWORD: str = Field(
-        default="",
-        description="The password for the provided email address",
-    )
-    SMTP_SERVER: str = Field(
-        default="smtp.gmail.com",
-        description="SMTP server address",
-    )
-    SMTP_PORT: int = Field(
-        default=465,
-        description="SMTP server port",
-    )
+from email.policy import SMTP
+from typing import Callable, Dict, List, Optional, Tuple
+
+import smtp_pool
+from smtp_pool import aiosmtplib
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class ToolsValves:
+    """
+    SMTP settings for the .env configured account.
+
+    A plain frozen dataclass: it is built once from our own config file and
+    never re-validated, so it doesn't need pydantic.
+    """
+
+    FROM_EMAIL: str = ""  # The email a LLM can use
+    # The password for the provided email address; kept out of repr() so it
+    # can't leak into logs.
+    PASSWORD: str = field(default="", repr=False)
+    SMTP_SERVER: str = "smtp.gmail.com"  # SMTP server address
+    SMTP_PORT: int = 465  # SMTP server port
+
+
+# RFC 5322 caps a header line at 998 characters; "Subject: " is the
+# longest name FastMessage writes.
+_MAX_HEADER_VALUE = 998 - len("Subject: ")
+_EOL = re.compile(r"\r\n|\r|\n")
+
+
+@dataclass(slots=True)
+class FastMessage:
+    """
+    A plain-text email held as ready-to-send header and body bytes.
+
+    Covers the common case - ASCII headers that fit on one line and an
+    ASCII body - without building a MIME object tree.  The wire form has
+    the same headers ``MIMEText`` would write for it.  :meth:`build`
+    returns None for anything else, so callers fall back to the email
+    package for encoded headers, non-ASCII bodies and SMTPUTF8 addresses.
+    """
+
+    sender: bytes
+    recipients: bytes
+    subject: bytes
+    body: bytes
+
+    @classmethod
+    def build(
+        cls, sender: str, recipients: List[str], subject: str, body: str
+    ) -> Optional["FastMessage"]:
+        to = ", ".join(recipients)
+        for value in (sender, to, subject):
+            if (not value.isascii() or len(value) > _MAX_HEADER_VALUE
+                    or "\r" in value or "\n" in value):
+                return None
+        if not body.isascii():
+            return None
+        return cls(
+            sender.encode("ascii"),
+            to.encode("ascii"),
+            subject.encode("ascii"),
+            _EOL.sub("\r\n", body).encode("ascii"),
+        )
+
+    def to_wire(self) -> bytes:
+        """The full message, CRLF line endings, ready for ``sendmail``."""
+        return (
+            b'Content-Type: text/plain; charset="us-ascii"\r\n'
+            b"MIME-Version: 1.0\r\n"
+            b"Content-Transfer-Encoding: 7bit\r\n"
+            b"Subject: %s\r\nFrom: %s\r\nTo: %s\r\n\r\n%s"
+            % (self.subject, self.sender, self.recipients, self.body)
+        )
+
+
+# One ``KEY=value`` line: comment lines are skipped, surrounding whitespace
+# is dropped, and a value wrapped in matching quotes is unwrapped.  A '#'
+# inside an unquoted value is kept (passwords may contain one).  A lone
+# quote character counts as wrapped and gives an empty value.
+_ENV_LINE = re.compile(
+    r"""^(?![ \t]*#)[ \t]*([^=\n]*?)[ \t]*=[ \t]*(?:"(.*)"|'(.*)'|["']()|(.*?))[ \t]*$""",
+    re.MULTILINE,
+)
+
+
+@functools.lru_cache(maxsize=8)
+def _parse_env_file(path: str, mtime_ns: int) -> Dict[str, str]:
+    """
+    Parse a ``KEY=value`` .env file into a dict.
+
+    Cached per ``(path, mtime_ns)``: re-loading an unchanged file skips the
+    read, and editing it changes the key so the next load re-parses.  The
+    returned dict is shared between callers - do not mutate it.
+    """
+    with open(path, "r") as f:
+        text = f.read()
+    # lastindex is whichever of the three value groups matched.
+    return {m[1]: m[m.lastindex] for m in _ENV_LINE.finditer(text)}
 
 
 class Tools:
@@ -34,13 +122,18 @@ class Tools:
         """
         if config_path:
             self.valves = self._load_config_from_file(config_path)
-            print(f"Configuration loaded from {config_path}")
-            print(f"SMTP Server {self.valves.SMTP_SERVER}:{self.valves.SMTP_PORT}")
-            print(f"From Email {self.valves.FROM_EMAIL}")
-            print(f"Password {'*' * len(self.valves.PASSWORD)}")  # Mask password
+            log.info("Configuration loaded from %s", config_path)
+            # Checked up front so normal boots skip building the masked
+            # password string as well as the records themselves.
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("SMTP Server %s:%s", self.valves.SMTP_SERVER, self.valves.SMTP_PORT)
+                log.debug("From Email %s", self.valves.FROM_EMAIL)
+                log.debug("Password %s", "*" * len(self.valves.PASSWORD))  # Mask password
         else:
             self.valves = ToolsValves()
-            print("Warning: No config path provided. Email sending will fail.")
+            log.warning("No config path provided. Email sending will fail.")
+        # ToolsValves is frozen, so this can't go stale.
+        self._configured = bool(self.valves.FROM_EMAIL and self.valves.PASSWORD)
 
     def _load_config_from_file(self, config_path: str) -> ToolsValves:
         """
@@ -49,21 +142,8 @@ class Tools:
         :param config_path: Path to the .env file
         :return: Valves instance with loaded configuration
         """
-        config_dict = {}
         try:
-            with open(config_path, "r") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line or line.startswith("#") or "=" not in line:
-                        continue
-                    key, value = line.split("=", 1)
-                    key = key.strip()
-                    value = value.strip()
-                    if (value.startswith("'") and value.endswith("'")) or (
-                        value.startswith('"') and value.endswith('"')
-                    ):
-                        value = value[1:-1]
-                    config_dict[key] = value
+            config_dict = _parse_env_file(config_path, os.stat(config_path).st_mtime_ns)
 
             required_fields = ["FROM_EMAIL", "PASSWORD"]
             for field in required_fields:
@@ -77,67 +157,262 @@ class Tools:
                 SMTP_PORT=int(config_dict.get("SMTP_PORT", 465)),
             )
         except Exception as e:
-            print(f"Error: Could not load config from {config_path}: {e}")
+            log.error("Could not load config from %s: %s", config_path, e)
             raise
 
+    def _precheck(self, recipients: List[str]) -> Optional[str]:
+        """Return an error message if a send cannot proceed, else None."""
+        if not self._configured:
+            error_msg = (
+                "Error: Email credentials not configured. "
+                "Please provide a config file with FROM_EMAIL and PASSWORD."
+            )
+            log.error(error_msg)
+            return error_msg
+
+        if not recipients:
+            error_msg = "Error: No recipients specified."
+            log.error(error_msg)
+            return error_msg
+        return None
+
+    def _log_attempt(self, recipients: List[str]) -> None:
+        log.debug("Attempting to send email from %s", self.valves.FROM_EMAIL)
+        log.debug("To recipients: %s", recipients)
+        log.debug(
+            "Using SMTP server %s:%s", self.valves.SMTP_SERVER, self.valves.SMTP_PORT
+        )
+
+    def _build_message(self, subject: str, body: str, recipients: List[str]) -> MIMEText:
+        """The email-package message, for what :class:`FastMessage` can't hold."""
+        msg = MIMEText(body)
+        msg["Subject"] = subject
+        msg["From"] = self.valves.FROM_EMAIL
+        msg["To"] = ", ".join(recipients)
+        return msg
+
     def send_email(self, subject: str, body: str, recipients: List[str]) -> str:
         """
         Send an email with the given parameters.
         """
         try:
-            if not self.valves.FROM_EMAIL or not self.valves.PASSWORD:
-                error_msg = (
-                    "Error: Email credentials not configured. "
-                    "Please provide a config file with FROM_EMAIL and PASSWORD."
-                )
-                print(error_msg)
-                return error_msg
-
-            if not recipients:
-                error_msg = "Error: No recipients specified."
-                print(error_msg)
+            error_msg = self._precheck(recipients)
+            if error_msg:
                 return error_msg
 
             sender: str = self.valves.FROM_EMAIL
             password: str = self.valves.PASSWORD
+            self._log_attempt(recipients)
+            fast = FastMessage.build(sender, recipients, subject, body)
+
+            log.debug("Acquiring SMTP connection...")
+            with smtp_pool.session(
+                self.valves.SMTP_SERVER, self.valves.SMTP_PORT, sender, password
+            ) as smtp_server:
+                log.debug("Sending email...")
+                if fast is not None:
+                    smtp_server.sendmail(sender, recipients, fast.to_wire())
+                else:
+                    smtp_server.send_message(
+                        self._build_message(subject, body, recipients),
+                        from_addr=sender, to_addrs=recipients,
+                    )
+                log.info("Email sent successfully")
+
+            return f"Message sent successfully to {', '.join(recipients)}"
+
+        except Exception as e:
+            return self._error_message(e)
+
+    def prebuild(self, subject: str, body: str, recipients: List[str]) -> bytes:
+        """
+        Build and flatten a message once, for sending repeatedly.
+
+        The bytes can go straight to ``sendmail`` any number of times without
+        running the MIME generator again.
+        """
+        self._log_attempt(recipients)
+        fast = FastMessage.build(self.valves.FROM_EMAIL, recipients, subject, body)
+        if fast is not None:
+            return fast.to_wire()
+        msg = self._build_message(subject, body, recipients)
+        buf = io.BytesIO()
+        # The message's own (compat32) policy RFC 2047-encodes non-ASCII
+        # headers; only the line endings need changing for the wire.
+        BytesGenerator(buf, policy=msg.policy.clone(linesep="\r\n")).flatten(msg)
+        return buf.getvalue()
+
+    def send_bulk(self, messages: List[Tuple[str, str, List[str]]]) -> List[str]:
+        """
+        Send several emails over one pooled SMTP session.
 
-            print(f"Attempting to send email from {sender}")
-            print(f"To recipients: {recipients}")
-            print(
-                f"Using SMTP server {self.valves.SMTP_SERVER}:{self.valves.SMTP_PORT}"
+        Pays for connect + TLS + AUTH once per pooled connection lifetime
+        (see ``smtp_pool.MAX_MESSAGES_PER_CONN``) instead of once per email.
+
+        :param messages: ``(subject, body, recipients)`` tuples.
+        :return: One result string per message, in order, worded as
+                 :meth:`send_email` would word it.
+        """
+        results: List[Optional[str]] = [self._precheck(r) for _, _, r in messages]
+        sender: str = self.valves.FROM_EMAIL
+
+        # Identical messages in one batch are only flattened once.
+        wire: Dict[Tuple[str, str, Tuple[str, ...]], bytes] = {}
+
+        def send_one(smtp_server, i: int) -> str:
+            subject, body, recipients = messages[i]
+            key = (subject, body, tuple(recipients))
+            data = wire.get(key)
+            if data is None:
+                data = wire[key] = self.prebuild(subject, body, recipients)
+            smtp_server.sendmail(sender, recipients, data)
+            return f"Message sent successfully to {', '.join(recipients)}"
+
+        self._deliver([i for i, result in enumerate(results) if result is None],
+                      results, send_one)
+        return results
+
+    def build_template(self, subject: str, body: str) -> EmailMessage:
+        """
+        Build a message with everything but the ``To`` header filled in.
+
+        Built once and re-addressed per recipient by :meth:`send_each`.
+        """
+        msg = EmailMessage(policy=SMTP)
+        msg["Subject"] = subject
+        msg["From"] = self.valves.FROM_EMAIL
+        msg.set_content(body)
+        return msg
+
+    def send_each(self, subject: str, body: str, recipients: List[str]) -> List[str]:
+        """
+        Send one copy of an email to every recipient separately.
+
+        Each copy is addressed to its recipient alone, so no one sees the
+        rest of the list.  The message is built once; only its ``To``
+        header changes between sends.
+
+        :return: One result string per recipient, in order.
+        """
+        error_msg = self._precheck(recipients)
+        if error_msg:
+            return [error_msg] * max(len(recipients), 1)
+        results: List[Optional[str]] = [None] * len(recipients)
+        sender: str = self.valves.FROM_EMAIL
+        msg = self.build_template(subject, body)
+        msg["To"] = recipients[0]
+
+        def send_one(smtp_server, i: int) -> str:
+            addr = recipients[i]
+            msg.replace_header("To", addr)
+            smtp_server.send_message(msg, from_addr=sender, to_addrs=[addr])
+            return f"Message sent successfully to {addr}"
+
+        self._deliver(list(range(len(recipients))), results, send_one)
+        return results
+
+    def _deliver(
+        self,
+        todo: List[int],
+        results: List[Optional[str]],
+        send_one: Callable[[smtp_pool._PooledSMTP, int], str],
+    ) -> None:
+        """
+        Call ``send_one(smtp_server, i)`` for each index in *todo*, storing
+        what it returns (or the error) in ``results[i]``.
+
+        Sends share pooled sessions, rotating to a fresh connection once one
+        is spent.  A refusal fails only that send; a broken session fails
+        every send not yet attempted.
+        """
+        pos = 0
+        try:
+            while pos < len(todo):
+                log.debug("Acquiring SMTP connection...")
+                with smtp_pool.session(
+                    self.valves.SMTP_SERVER, self.valves.SMTP_PORT,
+                    self.valves.FROM_EMAIL, self.valves.PASSWORD,
+                ) as smtp_server:
+                    while True:
+                        i = todo[pos]
+                        try:
+                            results[i] = send_one(smtp_server, i)
+                        except (smtplib.SMTPResponseException,
+                                smtplib.SMTPRecipientsRefused) as e:
+                            # Refused by the server; the session itself is fine.
+                            results[i] = self._error_message(e)
+                        pos += 1
+                        if pos == len(todo) or smtp_server.spent():
+                            break
+        except Exception as e:
+            error_msg = self._error_message(e)
+            for i in todo[pos:]:
+                results[i] = error_msg
+
+    @staticmethod
+    def _error_message(e: Exception) -> str:
+        """Log and return the user-facing message for a failed send."""
+        if isinstance(e, smtplib.SMTPAuthenticationError):
+            error_msg = (
+                "Error: Authentication failed. Check your email and password. "
+                f"Details: {str(e)}"
             )
+        elif isinstance(e, smtplib.SMTPException):
+            error_msg = f"Error: SMTP error occurred: {str(e)}"
+        else:
+            error_msg = f"Error: Failed to send email: {str(e)}"
+            log.exception("Unexpected error: %s", error_msg)
+            return error_msg
+        log.error(error_msg)
+        return error_msg
+
+    async def send_email_async(self, subject: str, body: str, recipients: List[str]) -> str:
+        """
+        Async :meth:`send_email` over the ``aiosmtplib`` pool.
+
+        Without ``aiosmtplib`` installed, runs :meth:`send_email` in a worker
+        thread so the event loop is still never blocked.
+        """
+        if aiosmtplib is None:
+            return await asyncio.to_thread(self.send_email, subject, body, recipients)
+        try:
+            error_msg = self._precheck(recipients)
+            if error_msg:
+                return error_msg
 
-            msg = MIMEText(body)
-            msg["Subject"] = subject
-            msg["From"] = sender
-            msg["To"] = ", ".join(recipients)
+            sender: str = self.valves.FROM_EMAIL
+            password: str = self.valves.PASSWORD
+            self._log_attempt(recipients)
+            fast = FastMessage.build(sender, recipients, subject, body)
 
-            print("Connecting to SMTP server...")
-            with smtplib.SMTP_SSL(
-                self.valves.SMTP_SERVER, self.valves.SMTP_PORT
+            log.debug("Acquiring SMTP connection...")
+            async with smtp_pool.async_session(
+                self.valves.SMTP_SERVER, self.valves.SMTP_PORT, sender, password
             ) as smtp_server:
-                print("Connected to SMTP server")
-                print("Logging in...")
-                smtp_server.login(sender, password)
-                print("Logged in successfully")
-                print("Sending email...")
-                smtp_server.sendmail(sender, recipients, msg.as_string())
-                print("Email sent successfully")
+                log.debug("Sending email...")
+                if fast is not None:
+                    await smtp_server.sendmail(sender, recipients, fast.to_wire())
+                else:
+                    await smtp_server.send_message(
+                        self._build_message(subject, body, recipients),
+                        sender=sender, recipients=recipients,
+                    )
+                log.info("Email sent successfully")
 
             return f"Message sent successfully to {', '.join(recipients)}"
 
-        except smtplib.SMTPAuthenticationError as e:
+        except aiosmtplib.SMTPAuthenticationError as e:
             error_msg = (
                 "Error: Authentication failed. Check your email and password. "
                 f"Details: {str(e)}"
             )
-            print(error_msg)
+            log.error(error_msg)
             return error_msg
-        except smtplib.SMTPException as e:
+        except aiosmtplib.SMTPException as e:
             error_msg = f"Error: SMTP error occurred: {str(e)}"
-            print(error_msg)
+            log.error(error_msg)
             return error_msg
         except Exception as e:
             error_msg = f"Error: Failed to send email: {str(e)}"
-            print(f"Unexpected error: {error_msg}")
-            return error_msg
\ No newline at end of file
+            log.exception("Unexpected error: %s", error_msg)
+            return error_msg
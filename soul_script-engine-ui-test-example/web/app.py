@@ -12,12 +12,19 @@ Prompt Injection Order
 5. Conversation       — Recent user/assistant messages (truncated to budget)
 """
 
+import asyncio
 import json
 import logging
+import os
+import pickle
+import re
+import secrets
+import threading
 import uuid
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Any, Callable, Optional
 
 import httpx
 import yaml
@@ -27,6 +34,23 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
 
+try:
+    import orjson
+    from fastapi.responses import ORJSONResponse
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
+
+try:
+    from yaml import CSafeDumper as _YamlDumper, CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml; pure-Python fallback
+    from yaml import SafeDumper as _YamlDumper, SafeLoader as _YamlLoader
+
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2)
+    _HTTP2 = True
+except ImportError:  # httpx[http2] not installed; HTTP/1.1 keep-alive only
+    _HTTP2 = False
+
 # ── Project paths ────────────────────────────────────────────────
 _PROJECT_ROOT = Path(__file__).resolve().parent.parent
 _CONFIG_DIR   = _PROJECT_ROOT / "config"
@@ -53,6 +77,7 @@ from contextlib import asynccontextmanager
 @asynccontextmanager
 async def _lifespan(application: FastAPI):
     """Build NotesFAISS on startup so Soul Script retrieval works immediately."""
+    global _http_client
     try:
         _rebuild_notes_faiss()
         from src.storage.note_collector import invalidate_notes_faiss
@@ -60,43 +85,134 @@ async def _lifespan(application: FastAPI):
     except Exception as exc:
         log.warning("[startup] NotesFAISS build skipped: %s", exc)
     yield
-
-app = FastAPI(title="SoulScript Engine", version="0.2.0", lifespan=_lifespan)
+    if _notes_rebuild_task is not None:
+        _notes_rebuild_task.cancel()
+    _flush_chat_index()
+    _flush_notes_index()
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+app = FastAPI(
+    title="SoulScript Engine", version="0.2.0", lifespan=_lifespan,
+    default_response_class=ORJSONResponse if orjson is not None else JSONResponse,
+)
 app.mount("/static", StaticFiles(directory=str(Path(__file__).parent / "static")), name="static")
 templates = Jinja2Templates(directory=str(Path(__file__).parent / "templates"))
 
+# ── Shared HTTP client ───────────────────────────────────────────
+# One pooled client for every outbound model-API call, so repeat calls
+# to the same endpoint reuse a kept-alive connection instead of paying
+# for DNS, TCP and TLS each time.  Per-call timeouts override the default.
+# HTTP/2 is negotiated when the ``h2`` package is available.
+_http_client: httpx.AsyncClient | None = None
+
+def _get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            timeout=120,
+            http2=_HTTP2,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        )
+    return _http_client
+
 # ── FAISS memory (lazy singleton) ────────────────────────────────
 _faiss_memory = None
+_faiss_memory_lock = threading.Lock()  # handlers reach this from worker threads
 
 def _get_faiss_memory():
     global _faiss_memory
-    if _faiss_memory is None:
+    if _faiss_memory is not None:
+        return _faiss_memory
+    with _faiss_memory_lock:
+        if _faiss_memory is not None:
+            return _faiss_memory
         try:
             from src.memory.faiss_memory import FAISSMemory
             _faiss_memory = FAISSMemory(
                 vault_path=str(_VAULT_PATH),
                 faiss_dir=str(_FAISS_DIR),
+                nprobe=_load_settings().get("vault_nprobe", 8),
+                use_mmap=True,
             )
             log.info("[vault] FAISSMemory loaded — %d memories", len(_faiss_memory.list_all()))
         except Exception as exc:
             log.error("[vault] FAISSMemory init failed: %s", exc)
     return _faiss_memory
 
+@lru_cache(maxsize=512)
+def _vault_search_cached(query: str, scope: str, top_k: int) -> tuple[dict, ...]:
+    """Vault search for prompt assembly, memoized per (query, scope, top_k).
+
+    Every route that writes to the vault calls ``.cache_clear()``.
+    """
+    fm = _get_faiss_memory()
+    return tuple(fm.search(query, scope=scope, top_k=top_k)) if fm else ()
+
 
 # ═══════════════════════════════════════════════════════════════════
-#  JSON HELPERS
+#  FILE CACHE & JSON HELPERS
 # ═══════════════════════════════════════════════════════════════════
 
+# path -> (st_mtime_ns, st_size, pickled parse result).  A hit costs one
+# stat() plus pickle.loads, which is several times cheaper than re-parsing
+# the JSON/YAML and still hands every caller its own copy to mutate.
+_FILE_CACHE: dict[Path, tuple[int, int, bytes]] = {}
+_FILE_CACHE_LOCK = threading.Lock()
+
+def _read_cached(path: Path, parse: Callable[[bytes], Any]):
+    """Return ``parse(path's bytes)``, re-parsing only when the file changes.
+
+    Raises FileNotFoundError if *path* does not exist.
+    """
+    st = path.stat()
+    with _FILE_CACHE_LOCK:
+        cached = _FILE_CACHE.get(path)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return pickle.loads(cached[2])
+    with open(path, "rb") as f:
+        st = os.fstat(f.fileno())  # key the entry to what is actually read
+        raw = f.read()
+    data = parse(raw)
+    with _FILE_CACHE_LOCK:
+        _FILE_CACHE[path] = (st.st_mtime_ns, st.st_size, pickle.dumps(data, pickle.HIGHEST_PROTOCOL))
+    return data
+
+def _forget_cached(path: Path):
+    with _FILE_CACHE_LOCK:
+        _FILE_CACHE.pop(path, None)
+
+_parse_json = orjson.loads if orjson is not None else json.loads
+
 def _read_json(path: Path, default=None):
-    if not path.exists():
+    try:
+        return _read_cached(path, _parse_json)
+    except FileNotFoundError:
         return default if default is not None else {}
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
 
-def _write_json(path: Path, data):
+def _write_json(path: Path, data, *, durable: bool = False):
+    """Serialize *data* to *path*.
+
+    With ``durable=True`` the bytes go to a temp file that is fsynced and
+    then renamed over *path*, so a crash leaves either the old or the new
+    file, never a truncated one.
+    """
+    _forget_cached(path)
     path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    if orjson is not None:
+        raw = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        raw = json.dumps(data, indent=2).encode("utf-8")
+    if not durable:
+        path.write_bytes(raw)
+        return
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(raw)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
 
 
 # ═══════════════════════════════════════════════════════════════════
@@ -140,26 +256,55 @@ def _save_settings(data: dict):
 #  PROFILES
 # ═══════════════════════════════════════════════════════════════════
 
+# (profiles dir st_mtime_ns, sorted names).  Adding, removing or renaming
+# a profile bumps the directory's mtime, so one stat() replaces the glob.
+_agents_cache: tuple[int, list[str]] | None = None
+
 def _list_agents() -> list[str]:
-    return sorted(p.stem for p in _PROFILES_DIR.glob("*.yaml"))
+    global _agents_cache
+    try:
+        mtime = _PROFILES_DIR.stat().st_mtime_ns
+    except FileNotFoundError:
+        return []
+    if _agents_cache is None or _agents_cache[0] != mtime:
+        _agents_cache = (mtime, sorted(p.stem for p in _PROFILES_DIR.glob("*.yaml")))
+    return list(_agents_cache[1])
+
+def _forget_agents():
+    """Drop the cached list, for filesystems whose mtime is too coarse to
+    tell two changes within the same tick apart."""
+    global _agents_cache
+    _agents_cache = None
+
+def _parse_yaml(raw: bytes):
+    return yaml.load(raw, Loader=_YamlLoader)
 
 def _load_profile(name: str) -> dict:
-    path = _PROFILES_DIR / f"{name}.yaml"
-    if not path.exists():
+    try:
+        return _read_cached(_PROFILES_DIR / f"{name}.yaml", _parse_yaml) or {}
+    except FileNotFoundError:
         return {}
-    with open(path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
 
 def _save_profile(name: str, data: dict):
-    with open(_PROFILES_DIR / f"{name}.yaml", "w", encoding="utf-8") as f:
-        yaml.dump(data, f, default_flow_style=False, allow_unicode=True)
+    path = _PROFILES_DIR / f"{name}.yaml"
+    _forget_cached(path)
+    with open(path, "w", encoding="utf-8") as f:
+        yaml.dump(data, f, Dumper=_YamlDumper, default_flow_style=False, allow_unicode=True)
+
+def _decode_text(raw: bytes) -> str:
+    """Decode like ``Path.read_text``: UTF-8 with universal newlines."""
+    return raw.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
 
 def _load_system_prompt(name: str) -> str:
-    path = _PROMPTS_DIR / f"{name}.system.md"
-    return path.read_text(encoding="utf-8") if path.exists() else ""
+    try:
+        return _read_cached(_PROMPTS_DIR / f"{name}.system.md", _decode_text)
+    except FileNotFoundError:
+        return ""
 
 def _save_system_prompt(name: str, text: str):
-    (_PROMPTS_DIR / f"{name}.system.md").write_text(text, encoding="utf-8")
+    path = _PROMPTS_DIR / f"{name}.system.md"
+    _forget_cached(path)
+    path.write_text(text, encoding="utf-8")
 
 def _get_agent_config(agent: str) -> dict:
     return _load_settings().get("agent_configs", {}).get(agent, {})
@@ -174,34 +319,151 @@ def _save_agent_config(agent: str, cfg: dict):
 #  CHATS
 # ═══════════════════════════════════════════════════════════════════
 
+# The chat index is read from disk once and then served from memory.
+# Entries live in "chats_by_id" (id -> entry), so every lookup, update and
+# delete is O(1); older index files holding a "chats" list are converted
+# on first load.  Structural changes (create/delete/rename) are written
+# straight away; the per-turn "updated" bump only marks the index dirty,
+# and a timer writes it out CHAT_INDEX_FLUSH_DELAY seconds later, batching
+# a burst of turns into one write.  Shutdown flushes whatever is pending.
+CHAT_INDEX_FLUSH_DELAY = 2.0  # seconds
+
+_chat_index: dict | None = None
+_chat_index_dirty = False
+_chat_index_timer: asyncio.TimerHandle | None = None
+
 def _load_chat_index() -> dict:
-    return _read_json(_CHATS_DIR / "index.json", {"folders": [], "chats": []})
+    """The live in-memory index; mutate it, then call _save_chat_index."""
+    global _chat_index
+    if _chat_index is None:
+        _chat_index = _read_json(_CHATS_DIR / "index.json", {"folders": [], "chats_by_id": {}})
+        if "chats_by_id" not in _chat_index:
+            _chat_index["chats_by_id"] = {c["id"]: c for c in _chat_index.pop("chats", [])}
+            _save_chat_index()
+    return _chat_index
+
+def _chat_index_view() -> dict:
+    """The index in the shape the chat page and /api/chat/history expect."""
+    idx = _load_chat_index()
+    return {"folders": idx.get("folders", []), "chats": list(idx["chats_by_id"].values())}
+
+def _save_chat_index():
+    global _chat_index_dirty
+    _chat_index_dirty = False
+    _write_json(_CHATS_DIR / "index.json", _chat_index)
+
+def _flush_chat_index():
+    global _chat_index_timer
+    if _chat_index_timer is not None:
+        _chat_index_timer.cancel()
+        _chat_index_timer = None
+    if _chat_index_dirty:
+        _save_chat_index()
+
+def _touch_chat_index(chat_id: str, **fields):
+    """Update one index entry in place and schedule a deferred write."""
+    global _chat_index_dirty, _chat_index_timer
+    entry = _load_chat_index()["chats_by_id"].get(chat_id)
+    if entry is None:
+        return
+    entry.update(fields)
+    _chat_index_dirty = True
+    if _chat_index_timer is None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:  # not inside the server (scripts, tests)
+            _flush_chat_index()
+            return
+        _chat_index_timer = loop.call_later(CHAT_INDEX_FLUSH_DELAY, _flush_chat_index)
 
-def _save_chat_index(data: dict):
-    _write_json(_CHATS_DIR / "index.json", data)
+# A chat is stored as {id}.meta.json (everything but the messages, small
+# and rewritten freely) plus {id}.messages.jsonl (one message per line,
+# only ever appended to).  A turn therefore writes just its new messages
+# instead of re-serializing the whole conversation.  Chats saved by older
+# versions as a single {id}.json are converted the first time they load.
 
-def _load_chat(chat_id: str) -> dict | None:
-    path = _CHATS_DIR / f"{chat_id}.json"
-    return _read_json(path) if path.exists() else None
+def _chat_meta_path(chat_id: str) -> Path:
+    return _CHATS_DIR / f"{chat_id}.meta.json"
+
+def _chat_messages_path(chat_id: str) -> Path:
+    return _CHATS_DIR / f"{chat_id}.messages.jsonl"
 
-def _save_chat(chat_id: str, data: dict):
-    _write_json(_CHATS_DIR / f"{chat_id}.json", data)
+def _json_line(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS) + b"\n"
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8") + b"\n"
+
+def _load_chat(chat_id: str) -> dict | None:
+    meta_path = _chat_meta_path(chat_id)
+    if not meta_path.exists():
+        legacy = _CHATS_DIR / f"{chat_id}.json"
+        if not legacy.exists():
+            return None
+        data = _read_json(legacy)
+        # Messages first: the meta file is what marks a chat as converted.
+        _chat_messages_path(chat_id).write_bytes(
+            b"".join(_json_line(m) for m in data.get("messages", []))
+        )
+        _save_chat_meta(chat_id, data)
+        _forget_cached(legacy)
+        legacy.unlink()
+        return data
+    data = _read_json(meta_path)
+    messages = []
+    try:
+        raw = _chat_messages_path(chat_id).read_bytes()
+    except FileNotFoundError:
+        raw = b""
+    for line in raw.splitlines():
+        if not line.strip():
+            continue
+        try:
+            messages.append(_parse_json(line))
+        except ValueError:
+            # A torn final line from an interrupted append.
+            log.warning("[chat] Skipping unreadable message line in %s", chat_id)
+    data["messages"] = messages
+    return data
+
+def _save_chat_meta(chat_id: str, data: dict):
+    _write_json(_chat_meta_path(chat_id), {k: v for k, v in data.items() if k != "messages"})
+
+def _append_chat_messages(chat_id: str, *messages: dict):
+    payload = b"".join(_json_line(m) for m in messages)
+    with open(_chat_messages_path(chat_id), "a+b") as f:
+        end = f.seek(0, os.SEEK_END)
+        if end:
+            f.seek(end - 1)
+            if f.read(1) != b"\n":
+                # Close off a torn line so it can't swallow this append.
+                payload = b"\n" + payload
+        f.write(payload)
+
+def _save_chat_turn(chat_data: dict, *messages: dict):
+    _append_chat_messages(chat_data["id"], *messages)
+    _save_chat_meta(chat_data["id"], chat_data)
 
 def _create_new_chat(agent: str) -> dict:
-    chat_id = str(uuid.uuid4())[:8]
+    # 64 random bits; re-draw on the (unlikely) clash with an existing chat
+    # so a new chat can never overwrite an old one's files.
+    while True:
+        chat_id = secrets.token_urlsafe(8)
+        if not (_chat_meta_path(chat_id).exists()
+                or (_CHATS_DIR / f"{chat_id}.json").exists()):
+            break
     now = datetime.now(timezone.utc).isoformat()
     chat_data = {
         "id": chat_id, "title": "New Chat", "folder_id": None,
         "agent": agent, "mode": "chat",
         "created": now, "updated": now, "messages": [],
     }
-    _save_chat(chat_id, chat_data)
-    idx = _load_chat_index()
-    idx["chats"].append({
+    _save_chat_meta(chat_id, chat_data)
+    _chat_messages_path(chat_id).touch()
+    _load_chat_index()["chats_by_id"][chat_id] = {
         "id": chat_id, "title": "New Chat", "folder_id": None,
         "agent": agent, "mode": "chat", "created": now, "updated": now,
-    })
-    _save_chat_index(idx)
+    }
+    _save_chat_index()
     return chat_data
 
 
@@ -209,15 +471,53 @@ def _create_new_chat(agent: str) -> dict:
 #  KNOWLEDGE (Notes)
 # ═══════════════════════════════════════════════════════════════════
 
+# Like the chat index, the notes index is read once and then kept in
+# memory.  _save_notes_index only marks it dirty; a timer writes it out
+# (fsync + rename) NOTES_INDEX_FLUSH_DELAY seconds later, so a burst of
+# edits such as a bulk import costs one durable write instead of one per
+# note.  Shutdown flushes whatever is pending.
+NOTES_INDEX_FLUSH_DELAY = 0.5  # seconds
+
+_notes_index: list[dict] | None = None
+_notes_index_dirty = False
+_notes_index_timer: asyncio.TimerHandle | None = None
+
 def _load_notes_index() -> list[dict]:
-    return _read_json(_NOTES_DIR / "index.json", [])
+    """The live in-memory index; mutate it, then call _save_notes_index."""
+    global _notes_index
+    if _notes_index is None:
+        _notes_index = _read_json(_NOTES_DIR / "index.json", [])
+    return _notes_index
+
+def _flush_notes_index():
+    global _notes_index_dirty, _notes_index_timer
+    if _notes_index_timer is not None:
+        _notes_index_timer.cancel()
+        _notes_index_timer = None
+    if _notes_index_dirty:
+        _notes_index_dirty = False
+        _write_json(_NOTES_DIR / "index.json", _notes_index, durable=True)
 
 def _save_notes_index(data: list[dict]):
-    _write_json(_NOTES_DIR / "index.json", data)
+    """Replace the in-memory index with *data* and schedule a write."""
+    global _notes_index, _notes_index_dirty, _notes_index_timer
+    _notes_index = data
+    _notes_index_dirty = True
+    if _notes_index_timer is None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:  # not inside the server (scripts, tests)
+            _flush_notes_index()
+            return
+        _notes_index_timer = loop.call_later(NOTES_INDEX_FLUSH_DELAY, _flush_notes_index)
 
 def _load_note(note_id: str) -> dict | None:
-    path = _NOTES_DIR / f"{note_id}.json"
-    return _read_json(path) if path.exists() else None
+    # Goes through the mtime-keyed file cache: an unchanged note costs one
+    # stat() and no JSON parse, which keeps NotesFAISS rebuilds cheap.
+    try:
+        return _read_cached(_NOTES_DIR / f"{note_id}.json", _parse_json)
+    except FileNotFoundError:
+        return None
 
 def _save_note(note_id: str, data: dict):
     _write_json(_NOTES_DIR / f"{note_id}.json", data)
@@ -227,9 +527,13 @@ def _save_note(note_id: str, data: dict):
 #  PROMPT ASSEMBLY — The core of SoulScript identity persistence
 # ═══════════════════════════════════════════════════════════════════
 
-def _build_chat_messages(agent: str, messages: list[dict]) -> tuple[list[dict], dict]:
+def _build_chat_messages(agent: str, messages: list[dict],
+                         latest_user_msg: str | None = None) -> tuple[list[dict], dict]:
     """Assemble the full prompt with identity + knowledge + memory layers.
 
+    *latest_user_msg* is the query for semantic retrieval; callers that
+    just appended the user turn pass it in, otherwise it is looked up.
+
     Returns (llm_messages, layer_metadata) where layer_metadata exposes
     exactly what was injected at each stage — for the Prompt Inspector UI.
 
@@ -254,11 +558,9 @@ def _build_chat_messages(agent: str, messages: list[dict]) -> tuple[list[dict],
     layers["base_prompt"]["preview"] = system_prompt[:300]
 
     # Get latest user message for semantic search
-    latest_user_msg = ""
-    for m in reversed(messages):
-        if m.get("role") == "user":
-            latest_user_msg = m.get("text", "")
-            break
+    if latest_user_msg is None:
+        latest_user_msg = next(
+            (m.get("text", "") for m in reversed(messages) if m.get("role") == "user"), "")
 
     # ── 2 & 3. Soul Script + Always-on knowledge ──
     always_block = ""
@@ -282,22 +584,20 @@ def _build_chat_messages(agent: str, messages: list[dict]) -> tuple[list[dict],
     # ── 4. Memory Vault context ──
     if latest_user_msg:
         try:
-            fm = _get_faiss_memory()
-            if fm:
-                results = fm.search(latest_user_msg, scope=agent, top_k=5)
-                if results:
-                    snippets = [r["text"] for r in results if r.get("text")]
-                    if snippets:
-                        vault_block = "\n\n---\n\n".join(snippets)
-                        system_prompt += (
-                            "\n\n## Memory Vault Context\n\n"
-                            "The following memories were retrieved from your persistent "
-                            "memory vault based on relevance to the current conversation:\n\n"
-                            + vault_block
-                        )
-                        layers["vault"]["memories"] = len(snippets)
-                        layers["vault"]["chars"] = len(vault_block)
-                        layers["vault"]["snippets"] = [s[:150] for s in snippets]
+            results = _vault_search_cached(latest_user_msg, agent, 5)
+            if results:
+                snippets = [r["text"] for r in results if r.get("text")]
+                if snippets:
+                    vault_block = "\n\n---\n\n".join(snippets)
+                    system_prompt += (
+                        "\n\n## Memory Vault Context\n\n"
+                        "The following memories were retrieved from your persistent "
+                        "memory vault based on relevance to the current conversation:\n\n"
+                        + vault_block
+                    )
+                    layers["vault"]["memories"] = len(snippets)
+                    layers["vault"]["chars"] = len(vault_block)
+                    layers["vault"]["snippets"] = [s[:150] for s in snippets]
         except Exception as exc:
             log.warning("[prompt] Vault search failed: %s", exc)
 
@@ -322,10 +622,12 @@ def _build_chat_messages(agent: str, messages: list[dict]) -> tuple[list[dict],
     budget = MAX_CONTEXT_CHARS
     for m in reversed(messages):
         text = m.get("text", "")
-        if len(text) > budget:
+        tlen = len(text)
+        if tlen > budget:
             break
-        budget -= len(text)
-        conversation.insert(0, {"role": m["role"], "content": text})
+        budget -= tlen
+        conversation.append({"role": m["role"], "content": text})
+    conversation.reverse()  # collected newest-first
 
     layers["conversation"]["turns"] = len(conversation)
     layers["conversation"]["chars"] = MAX_CONTEXT_CHARS - budget
@@ -333,15 +635,49 @@ def _build_chat_messages(agent: str, messages: list[dict]) -> tuple[list[dict],
     return [{"role": "system", "content": system_prompt}] + conversation, layers
 
 
-def _extract_and_save_memories(agent: str, response_text: str) -> list[dict]:
-    """Parse [MEMORY_SAVE: ...] tags from response and write to vault.
+# [MEMORY_SAVE: category=<cat> | <text>] — the text may span lines and
+# runs to the first "]".  Tags are located with str.find (a C-level scan,
+# no regex backtracking over long replies); only the short body between
+# the brackets goes through a regex, anchored at both ends.
+_MEMSAVE_OPEN = "[MEMORY_SAVE:"
+_MEMSAVE_BODY_RE = re.compile(r'\s*(?:category=(\w+)\s*\|)?\s*(.+)', re.DOTALL)
+_MEMORY_CATEGORIES = frozenset(
+    {"bio", "preference", "project", "lore", "session", "meta", "health", "self", "other"}
+)
+
+
+def _split_memory_tags(text: str) -> tuple[str, list[tuple[str | None, str]]]:
+    """Remove [MEMORY_SAVE: ...] tags from *text* in a single scan.
+
+    Returns (text shown to the user, [(category or None, memory text), ...]).
+    """
+    tags: list[tuple[str | None, str]] = []
+    parts: list[str] = []
+    pos = 0
+    start = text.find(_MEMSAVE_OPEN)
+    while start != -1:
+        body_start = start + len(_MEMSAVE_OPEN)
+        end = text.find("]", body_start)
+        if end == -1:
+            break  # no closing bracket anywhere after this point
+        m = _MEMSAVE_BODY_RE.fullmatch(text, body_start, end)
+        if m:
+            parts.append(text[pos:start])
+            tags.append(m.groups())
+            pos = end + 1
+        start = text.find(_MEMSAVE_OPEN, pos if m else body_start)
+    if not tags:
+        return text.strip(), tags
+    parts.append(text[pos:])
+    return "".join(parts).strip(), tags
+
+
+def _save_memory_tags(agent: str, tags: list[tuple[str | None, str]]) -> list[dict]:
+    """Write parsed [MEMORY_SAVE: ...] tags to the vault.
 
     Returns list of saved memory summaries (for optional UI feedback).
     """
-    import re
-    pattern = r'\[MEMORY_SAVE:\s*(?:category=([\w]+)\s*\|)?\s*(.+?)\]'
-    matches = re.findall(pattern, response_text, re.DOTALL)
-    if not matches:
+    if not tags:
         return []
 
     fm = _get_faiss_memory()
@@ -350,13 +686,12 @@ def _extract_and_save_memories(agent: str, response_text: str) -> list[dict]:
         return []
 
     saved = []
-    for category_raw, text_raw in matches:
+    for category_raw, text_raw in tags:
         category = (category_raw or "other").strip().lower()
         text = text_raw.strip()
         if not text or len(text) < 5:
             continue
-        valid_cats = {"bio", "preference", "project", "lore", "session", "meta", "health", "self", "other"}
-        if category not in valid_cats:
+        if category not in _MEMORY_CATEGORIES:
             category = "other"
         try:
             mem = fm.add(
@@ -370,15 +705,11 @@ def _extract_and_save_memories(agent: str, response_text: str) -> list[dict]:
             log.info("[memory] Saved to vault: scope=%s cat=%s text=%.60s", agent, category, text)
         except Exception as exc:
             log.error("[memory] Failed to save memory: %s", exc)
+    if saved:
+        _vault_search_cached.cache_clear()
     return saved
 
 
-def _strip_memory_tags(text: str) -> str:
-    """Remove [MEMORY_SAVE: ...] tags from text shown to user."""
-    import re
-    return re.sub(r'\[MEMORY_SAVE:\s*(?:category=[\w]+\s*\|)?\s*.+?\]', '', text).strip()
-
-
 # ═══════════════════════════════════════════════════════════════════
 #  PAGE ROUTES
 # ═══════════════════════════════════════════════════════════════════
@@ -388,7 +719,7 @@ async def root():
     return RedirectResponse(url="/chat", status_code=302)
 
 @app.get("/chat", response_class=HTMLResponse)
-async def page_chat(request: Request):
+def page_chat(request: Request):
     agents = _list_agents()
     store = _load_connections()
     conns = [c for c in store.get("connections", []) if c.get("enabled")]
@@ -396,13 +727,13 @@ async def page_chat(request: Request):
     return templates.TemplateResponse("chat.html", {
         "request": request, "page": "chat",
         "agents": agents, "connections": conns,
-        "chat_index": _load_chat_index(),
+        "chat_index": _chat_index_view(),
         "agent_connections": store.get("agent_connections", {}),
         "avatar_map": settings.get("agent_avatars", {}),
     })
 
 @app.get("/profiles", response_class=HTMLResponse)
-async def page_profiles(request: Request):
+def page_profiles(request: Request):
     agents = _list_agents()
     settings = _load_settings()
     agent_data = {}
@@ -415,12 +746,11 @@ async def page_profiles(request: Request):
             "display_name": cfg.get("display_name", name),
         }
     store = _load_connections()
-    all_models = []
-    for c in store.get("connections", []):
-        if c.get("enabled"):
-            for m in c.get("models", []):
-                if m not in all_models:
-                    all_models.append(m)
+    # Ordered de-duplication in one pass (dict keys keep first-seen order).
+    all_models = list(dict.fromkeys(
+        m for c in store.get("connections", []) if c.get("enabled")
+        for m in c.get("models", [])
+    ))
     notes = [n for n in _load_notes_index() if not n.get("trashed")]
     return templates.TemplateResponse("profiles.html", {
         "request": request, "page": "profiles",
@@ -430,7 +760,7 @@ async def page_profiles(request: Request):
     })
 
 @app.get("/vault", response_class=HTMLResponse)
-async def page_vault(request: Request, q: str = "", scope: str = "", category: str = ""):
+def page_vault(request: Request, q: str = "", scope: str = "", category: str = ""):
     fm = _get_faiss_memory()
     memories, scopes, categories = [], [], []
     stats = {"active_count": 0, "max_active": 500, "utilization_pct": 0,
@@ -447,7 +777,7 @@ async def page_vault(request: Request, q: str = "", scope: str = "", category: s
             all_mems = fm.list_all(scope=scope or None)
             if category:
                 all_mems = [m for m in all_mems if getattr(m, "category", "") == category]
-            memories = [m.__dict__ if hasattr(m, "__dict__") else m for m in all_mems]
+            memories = [m.to_dict() if hasattr(m, "to_dict") else m for m in all_mems]
         all_raw = fm.list_all()
         scopes = sorted({getattr(m, "scope", "") for m in all_raw} - {""})
         categories = sorted({getattr(m, "category", "") for m in all_raw} - {""})
@@ -460,14 +790,14 @@ async def page_vault(request: Request, q: str = "", scope: str = "", category: s
     })
 
 @app.get("/knowledge", response_class=HTMLResponse)
-async def page_knowledge(request: Request):
+def page_knowledge(request: Request):
     notes = [n for n in _load_notes_index() if not n.get("trashed")]
     return templates.TemplateResponse("knowledge.html", {
         "request": request, "page": "knowledge", "notes": notes,
     })
 
 @app.get("/knowledge/{note_id}/edit", response_class=HTMLResponse)
-async def page_knowledge_edit(request: Request, note_id: str):
+def page_knowledge_edit(request: Request, note_id: str):
     note = _load_note(note_id)
     if not note:
         return RedirectResponse(url="/knowledge", status_code=302)
@@ -476,7 +806,7 @@ async def page_knowledge_edit(request: Request, note_id: str):
     })
 
 @app.get("/settings", response_class=HTMLResponse)
-async def page_settings(request: Request, tab: str = "connections"):
+def page_settings(request: Request, tab: str = "connections"):
     store = _load_connections()
     return templates.TemplateResponse("settings.html", {
         "request": request, "page": "settings",
@@ -503,7 +833,7 @@ def _save_about(data: dict):
     _write_json(ABOUT_FILE, data)
 
 @app.get("/about", response_class=HTMLResponse)
-async def page_about(request: Request):
+def page_about(request: Request):
     about = _load_about()
     return templates.TemplateResponse("about.html", {
         "request": request, "page": "about", "about_text": about.get("text", ""),
@@ -535,21 +865,26 @@ async def api_chat_send(req: ChatRequest):
     if not conn:
         return JSONResponse({"error": "No API connection available. Add one in Settings."}, 400)
 
-    chat_data = _load_chat(req.chat_id) if req.chat_id else None
+    # Disk reads, prompt assembly (vault search included) and the writes
+    # below run in worker threads so concurrent turns don't queue up
+    # behind each other's disk I/O on the event loop.
+    chat_data = await asyncio.to_thread(_load_chat, req.chat_id) if req.chat_id else None
     if req.chat_id and not chat_data:
         return JSONResponse({"error": "Chat not found"}, 404)
     if not chat_data:
         chat_data = _create_new_chat(req.agent)
 
     now = datetime.now(timezone.utc).isoformat()
-    chat_data["messages"].append({"role": "user", "text": req.stimulus, "time": now})
+    user_msg = {"role": "user", "text": req.stimulus, "time": now}
+    chat_data["messages"].append(user_msg)
     chat_data["updated"] = now
 
     # Build prompt with all identity layers
-    llm_messages, layers = _build_chat_messages(req.agent, chat_data["messages"])
+    llm_messages, layers = await asyncio.to_thread(
+        _build_chat_messages, req.agent, chat_data["messages"], req.stimulus)
 
     # Resolve model
-    profile = _load_profile(req.agent)
+    profile = await asyncio.to_thread(_load_profile, req.agent)
     agent_cfg = _get_agent_config(req.agent)
     model = (
         req.model_override
@@ -567,14 +902,13 @@ async def api_chat_send(req: ChatRequest):
         headers["Authorization"] = f"Bearer {conn['api_key']}"
 
     try:
-        async with httpx.AsyncClient(timeout=120) as client:
-            resp = await client.post(url, json={
-                "model": model,
-                "messages": llm_messages,
-                "temperature": profile.get("temperature", 0.7),
-            }, headers=headers)
-            resp.raise_for_status()
-            data = resp.json()
+        resp = await _get_http_client().post(url, json={
+            "model": model,
+            "messages": llm_messages,
+            "temperature": profile.get("temperature", 0.7),
+        }, headers=headers)
+        resp.raise_for_status()
+        data = resp.json()
     except httpx.HTTPStatusError as exc:
         return JSONResponse({"error": f"API {exc.response.status_code}: {exc.response.text[:200]}"}, 502)
     except Exception as exc:
@@ -583,24 +917,21 @@ async def api_chat_send(req: ChatRequest):
     raw_response = data.get("choices", [{}])[0].get("message", {}).get("content", "")
     usage = data.get("usage", {})
 
-    # Extract and save any [MEMORY_SAVE: ...] tags to the vault
-    saved_memories = _extract_and_save_memories(req.agent, raw_response)
-    # Strip memory tags from the text shown to the user
-    response_text = _strip_memory_tags(raw_response)
+    # Strip [MEMORY_SAVE: ...] tags from the text shown to the user and
+    # save what they carried to the vault
+    response_text, memory_tags = _split_memory_tags(raw_response)
+    saved_memories = (await asyncio.to_thread(_save_memory_tags, req.agent, memory_tags)
+                      if memory_tags else [])
 
-    chat_data["messages"].append({
+    assistant_msg = {
         "role": "assistant", "text": response_text, "time": now,
         "usage": usage, "data": {"agent": req.agent, "model": model, "usage": usage},
         "layers": layers,
-    })
-    _save_chat(chat_data["id"], chat_data)
+    }
+    chat_data["messages"].append(assistant_msg)
+    await asyncio.to_thread(_save_chat_turn, chat_data, user_msg, assistant_msg)
 
-    idx = _load_chat_index()
-    for c in idx["chats"]:
-        if c["id"] == chat_data["id"]:
-            c["updated"] = now
-            break
-    _save_chat_index(idx)
+    _touch_chat_index(chat_data["id"], updated=now)
 
     return {
         "response": response_text, "chat_id": chat_data["id"],
@@ -610,7 +941,7 @@ async def api_chat_send(req: ChatRequest):
 
 @app.get("/api/chat/history")
 async def api_chat_history():
-    return _load_chat_index()
+    return _chat_index_view()
 
 @app.post("/api/chat/new")
 async def api_chat_new(request: Request):
@@ -620,18 +951,19 @@ async def api_chat_new(request: Request):
     return _create_new_chat(agent)
 
 @app.get("/api/chat/{chat_id}")
-async def api_chat_get(chat_id: str):
+def api_chat_get(chat_id: str):
     data = _load_chat(chat_id)
     return data if data else JSONResponse({"error": "Not found"}, 404)
 
 @app.delete("/api/chat/{chat_id}")
 async def api_chat_delete(chat_id: str):
-    path = _CHATS_DIR / f"{chat_id}.json"
-    if path.exists():
-        path.unlink()
-    idx = _load_chat_index()
-    idx["chats"] = [c for c in idx["chats"] if c["id"] != chat_id]
-    _save_chat_index(idx)
+    for path in (_chat_meta_path(chat_id), _chat_messages_path(chat_id),
+                 _CHATS_DIR / f"{chat_id}.json"):
+        _forget_cached(path)
+        if path.exists():
+            path.unlink()
+    if _load_chat_index()["chats_by_id"].pop(chat_id, None) is not None:
+        _save_chat_index()
     return {"ok": True}
 
 @app.put("/api/chat/{chat_id}")
@@ -643,18 +975,16 @@ async def api_chat_update(chat_id: str, request: Request):
     for key in ("title", "folder_id"):
         if key in body:
             data[key] = body[key]
-    _save_chat(chat_id, data)
-    idx = _load_chat_index()
-    for c in idx["chats"]:
-        if c["id"] == chat_id:
-            c.update({k: body[k] for k in ("title", "folder_id") if k in body})
-            break
-    _save_chat_index(idx)
+    _save_chat_meta(chat_id, data)
+    entry = _load_chat_index()["chats_by_id"].get(chat_id)
+    if entry is not None:
+        entry.update({k: body[k] for k in ("title", "folder_id") if k in body})
+        _save_chat_index()
     return {"ok": True}
 
 @app.post("/api/chat/{chat_id}/title")
 async def api_chat_auto_title(chat_id: str):
-    data = _load_chat(chat_id)
+    data = await asyncio.to_thread(_load_chat, chat_id)
     if not data or len(data.get("messages", [])) < 2:
         return {"title": None}
 
@@ -664,7 +994,7 @@ async def api_chat_auto_title(chat_id: str):
         return {"title": None}
 
     snippet = "\n".join(f"{m['role']}: {m['text'][:200]}" for m in data["messages"][:4])
-    profile = _load_profile(agent)
+    profile = await asyncio.to_thread(_load_profile, agent)
     model = _get_agent_config(agent).get("model") or profile.get("model", "") or "gpt-4o-mini"
 
     url = conn["url"].rstrip("/")
@@ -675,28 +1005,25 @@ async def api_chat_auto_title(chat_id: str):
         headers["Authorization"] = f"Bearer {conn['api_key']}"
 
     try:
-        async with httpx.AsyncClient(timeout=30) as client:
-            resp = await client.post(url, json={
-                "model": model,
-                "messages": [
-                    {"role": "system", "content": "Generate a short (3-6 word) title for this conversation. Reply with ONLY the title."},
-                    {"role": "user", "content": snippet},
-                ],
-                "temperature": 0.5, "max_tokens": 20,
-            }, headers=headers)
-            resp.raise_for_status()
-            title = resp.json()["choices"][0]["message"]["content"].strip().strip('"')
+        resp = await _get_http_client().post(url, json={
+            "model": model,
+            "messages": [
+                {"role": "system", "content": "Generate a short (3-6 word) title for this conversation. Reply with ONLY the title."},
+                {"role": "user", "content": snippet},
+            ],
+            "temperature": 0.5, "max_tokens": 20,
+        }, headers=headers, timeout=30)
+        resp.raise_for_status()
+        title = resp.json()["choices"][0]["message"]["content"].strip().strip('"')
     except Exception:
         return {"title": None}
 
     data["title"] = title
-    _save_chat(chat_id, data)
-    idx = _load_chat_index()
-    for c in idx["chats"]:
-        if c["id"] == chat_id:
-            c["title"] = title
-            break
-    _save_chat_index(idx)
+    await asyncio.to_thread(_save_chat_meta, chat_id, data)
+    entry = _load_chat_index()["chats_by_id"].get(chat_id)
+    if entry is not None:
+        entry["title"] = title
+        _save_chat_index()
     return {"title": title}
 
 
@@ -739,13 +1066,16 @@ async def api_profile_create(request: Request):
     _save_profile(name, {"name": name, "model": body.get("model", ""), "temperature": 0.7,
                          "system_prompt": f"{name}.system.md"})
     _save_system_prompt(name, body.get("system_prompt", f"You are {name}."))
+    _forget_agents()
     return {"ok": True, "name": name}
 
 @app.delete("/api/profiles/{name}")
 async def api_profile_delete(name: str):
     for p in [_PROFILES_DIR / f"{name}.yaml", _PROMPTS_DIR / f"{name}.system.md"]:
+        _forget_cached(p)
         if p.exists():
             p.unlink()
+    _forget_agents()
     settings = _load_settings()
     settings.get("agent_configs", {}).pop(name, None)
     _save_settings(settings)
@@ -758,14 +1088,36 @@ async def api_profile_knowledge(name: str, request: Request):
     cfg["attached_notes"] = body.get("attached_notes", [])
     cfg["note_modes"] = body.get("note_modes", {})
     _save_agent_config(name, cfg)
-    try:
-        from src.storage.note_collector import invalidate_notes_faiss
-        invalidate_notes_faiss()
-        _rebuild_notes_faiss()
-    except Exception as exc:
-        log.warning("[knowledge] FAISS rebuild skipped: %s", exc)
+    _schedule_notes_rebuild()
     return {"ok": True}
 
+# Knowledge edits rebuild NotesFAISS in the background: the request
+# returns at once, edits within NOTES_REBUILD_DELAY of each other share
+# one rebuild, and an edit that lands mid-rebuild triggers exactly one
+# more run when the current one finishes.
+NOTES_REBUILD_DELAY = 1.0  # seconds
+
+_notes_rebuild_task: asyncio.Task | None = None
+_notes_rebuild_dirty = False
+
+def _schedule_notes_rebuild():
+    global _notes_rebuild_task, _notes_rebuild_dirty
+    _notes_rebuild_dirty = True
+    if _notes_rebuild_task is None or _notes_rebuild_task.done():
+        _notes_rebuild_task = asyncio.get_running_loop().create_task(_notes_rebuild_worker())
+
+async def _notes_rebuild_worker():
+    global _notes_rebuild_dirty
+    while _notes_rebuild_dirty:
+        await asyncio.sleep(NOTES_REBUILD_DELAY)
+        _notes_rebuild_dirty = False
+        try:
+            await asyncio.to_thread(_rebuild_notes_faiss)
+            from src.storage.note_collector import invalidate_notes_faiss
+            invalidate_notes_faiss()      # next retrieval loads the new index
+        except Exception as exc:
+            log.warning("[knowledge] FAISS rebuild skipped: %s", exc)
+
 def _rebuild_notes_faiss():
     """Rebuild NotesFAISS index from all directive-mode notes across agents.
 
@@ -782,41 +1134,40 @@ def _rebuild_notes_faiss():
     def _chunk_text(text: str, doc_id: str, title: str) -> list[dict]:
         """Split text into overlapping chunks, preferring ### boundaries."""
         import re
-        sections: list[tuple[str, str]] = []  # (section_title, body)
+        # (section_title, heading line, body).  The "### title" line is kept
+        # apart from the body and only joined onto the first chunk, so a long
+        # section is windowed over its original string instead of a copy.
+        sections: list[tuple[str, str, str]] = []
         parts = re.split(r'(?m)^###\s+', text)
         if len(parts) > 1:
             # First part is content before any header
             if parts[0].strip():
-                sections.append((title, parts[0].strip()))
+                sections.append((title, '', parts[0].strip()))
             for part in parts[1:]:
                 lines = part.split('\n', 1)
                 sec_title = lines[0].strip()
                 sec_body = lines[1].strip() if len(lines) > 1 else ''
                 if sec_body:
-                    sections.append((sec_title, f'### {sec_title}\n{sec_body}'))
+                    sections.append((sec_title, f'### {sec_title}\n', sec_body))
         else:
-            sections.append((title, text))
+            sections.append((title, '', text))
 
         out = []
-        for sec_title, body in sections:
-            if len(body) <= CHUNK_TARGET + 100:
-                out.append({
-                    "text": body,
-                    "metadata": {"document_id": doc_id, "document_title": title,
-                                 "section_path": sec_title},
-                })
-            else:
-                # Sliding window with overlap
-                step = max(CHUNK_TARGET - CHUNK_OVERLAP, 200)
-                for i in range(0, len(body), step):
-                    chunk = body[i:i + CHUNK_TARGET]
-                    if len(chunk) < 80 and out:
-                        break  # skip tiny trailing scraps
-                    out.append({
-                        "text": chunk,
-                        "metadata": {"document_id": doc_id, "document_title": title,
-                                     "section_path": sec_title},
-                    })
+        for sec_title, head, body in sections:
+            # One metadata dict per section, shared by its chunks: the
+            # index only reads it.
+            meta = {"document_id": doc_id, "document_title": title,
+                    "section_path": sec_title}
+            if len(head) + len(body) <= CHUNK_TARGET + 100:
+                out.append({"text": head + body, "metadata": meta})
+                continue
+            # Sliding window with overlap
+            step = max(CHUNK_TARGET - CHUNK_OVERLAP, 200)
+            slices = [body[i:i + CHUNK_TARGET] for i in range(0, len(body), step)]
+            if len(slices) > 1 and len(slices[-1]) < 80:
+                slices.pop()  # skip a tiny trailing scrap
+            slices[0] = head + slices[0]
+            out.extend({"text": c, "metadata": meta} for c in slices)
         return out
 
     chunks: list[dict] = []
@@ -863,6 +1214,7 @@ async def api_vault_add(request: Request):
             source=body.get("source", "manual"),
             tags=body.get("tags", []),
         )
+        _vault_search_cached.cache_clear()
         return {"status": "saved", "id": mem.id, "text": text[:120]}
     except Exception as exc:
         return JSONResponse({"error": str(exc)}, 500)
@@ -879,6 +1231,7 @@ async def api_vault_delete(request: Request):
     if not fm:
         return {"error": "Vault not available"}
     deleted = [mid for mid in body.get("ids", []) if fm.delete(mid)]
+    _vault_search_cached.cache_clear()
     return {"deleted": deleted}
 
 @app.get("/api/vault/compact")
@@ -888,6 +1241,7 @@ async def api_vault_compact():
         return {"error": "Vault not available"}
     before = fm.stats().get("raw_lines", 0)
     fm.rebuild_index()
+    _vault_search_cached.cache_clear()
     return {"before_lines": before, "after_lines": fm.stats().get("raw_lines", 0)}
 
 
@@ -986,22 +1340,36 @@ async def api_connections_create(request: Request):
 async def api_connections_update(conn_id: str, request: Request):
     body = await request.json()
     store = _load_connections()
-    for c in store["connections"]:
-        if c["id"] == conn_id:
-            for key in ("name", "type", "provider", "url", "api_key", "models", "enabled"):
-                if key in body:
-                    c[key] = body[key]
-            break
-    _save_connections(store)
+    conn = next((c for c in store["connections"] if c["id"] == conn_id), None)
+    if conn is not None:
+        for key in ("name", "type", "provider", "url", "api_key", "models", "enabled"):
+            if key in body:
+                conn[key] = body[key]
+        _save_connections(store)
     return {"ok": True}
 
 @app.delete("/api/connections/{conn_id}")
 async def api_connections_delete(conn_id: str):
     store = _load_connections()
-    store["connections"] = [c for c in store["connections"] if c["id"] != conn_id]
-    _save_connections(store)
+    conns = store["connections"]
+    store["connections"] = [c for c in conns if c["id"] != conn_id]
+    if len(store["connections"]) != len(conns):
+        _save_connections(store)
     return {"ok": True}
 
+async def _list_provider_models(provider: str, base_url: str, headers: dict) -> list[str]:
+    """Sorted model names from an Ollama (/api/tags) or OpenAI-style (/models) API."""
+    if provider == "ollama":
+        url, list_key, name_key = f"{base_url}/api/tags", "models", "name"
+    else:
+        url, list_key, name_key = f"{base_url}/models", "data", "id"
+    resp = await _get_http_client().get(url, headers=headers, timeout=15)
+    resp.raise_for_status()
+    # Catalogs can list hundreds of models; parse the raw body with orjson
+    # when available rather than through resp.json()'s stdlib decoder.
+    data = _parse_json(resp.content)
+    return sorted(m[name_key] for m in data.get(list_key, []))
+
 @app.get("/api/connections/{conn_id}/models")
 async def api_connections_fetch_models(conn_id: str):
     store = _load_connections()
@@ -1014,22 +1382,11 @@ async def api_connections_fetch_models(conn_id: str):
     headers = {"Authorization": f"Bearer {conn['api_key']}"} if conn.get("api_key") else {}
 
     try:
-        async with httpx.AsyncClient(timeout=15) as client:
-            if provider == "ollama":
-                resp = await client.get(f"{base_url}/api/tags", headers=headers)
-                resp.raise_for_status()
-                models = sorted(m["name"] for m in resp.json().get("models", []))
-            else:
-                resp = await client.get(f"{base_url}/models", headers=headers)
-                resp.raise_for_status()
-                models = sorted(m["id"] for m in resp.json().get("data", []))
+        models = await _list_provider_models(provider, base_url, headers)
     except Exception as exc:
         return {"error": str(exc)}
 
-    for c in store["connections"]:
-        if c["id"] == conn_id:
-            c["models"] = models
-            break
+    conn["models"] = models  # same dict as in store["connections"]
     _save_connections(store)
     return {"models": models}
 
@@ -1045,15 +1402,7 @@ async def api_connections_probe_models(request: Request):
         return JSONResponse({"error": "URL is required"}, 400)
     headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
     try:
-        async with httpx.AsyncClient(timeout=15) as client:
-            if provider == "ollama":
-                resp = await client.get(f"{base_url}/api/tags", headers=headers)
-                resp.raise_for_status()
-                models = sorted(m["name"] for m in resp.json().get("models", []))
-            else:
-                resp = await client.get(f"{base_url}/models", headers=headers)
-                resp.raise_for_status()
-                models = sorted(m["id"] for m in resp.json().get("data", []))
+        models = await _list_provider_models(provider, base_url, headers)
     except Exception as exc:
         return {"error": str(exc)}
     return {"models": models}